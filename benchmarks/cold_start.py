@@ -0,0 +1,87 @@
+"""Cold start and rerun timings for every page of the app.
+
+Each page is run in a fresh Python process, the way the first visitor after a server
+restart sees it: Streamlit itself is already imported (the server loads it at startup),
+everything the page pulls in on top of that is not. The script reports the first run,
+the median warm rerun and which heavy modules the first run had to import. --via-home
+opens main.py first and waits a moment before the page, like a visitor who lands on the
+home page and then picks a module.
+
+    python benchmarks/cold_start.py                   # 5 fresh processes per page
+    python benchmarks/cold_start.py --via-home --repeat 10 --out via_home.json
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+SCRIPTS = ["main.py", "pages/1_Process_Management.py", "pages/2_Memory_Management.py",
+           "pages/3_File_Systems.py", "pages/4_IO_Systems.py"]
+HEAVY_MODULES = ["pandas", "pyarrow", "plotly.graph_objects", "numpy"]
+
+def child(script, reruns, via_home):
+    sys.path.insert(0, str(ROOT))      # streamlit run puts the main script's folder on sys.path
+    from streamlit.testing.v1 import AppTest
+    if via_home:
+        AppTest.from_file(str(ROOT / "main.py"), default_timeout=120).run()
+        time.sleep(via_home)
+    before = set(sys.modules)
+    at = AppTest.from_file(str(ROOT / script), default_timeout=120)
+    start = time.perf_counter()
+    at.run()
+    first = time.perf_counter() - start
+    loaded = set(sys.modules) - before
+    warm = []
+    for _ in range(reruns):
+        start = time.perf_counter()
+        at.run()
+        warm.append(time.perf_counter() - start)
+    print(json.dumps({
+        'first_s': first, 'rerun_s': statistics.median(warm),
+        'modules_imported': len(loaded), 'heavy': [m for m in HEAVY_MODULES if m in loaded],
+        'errors': [str(e.value) for e in at.exception],
+    }))
+
+def measure(script, repeat, reruns, via_home):
+    runs = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, __file__, '--child', script, '--reruns', str(reruns),
+                              '--via-home', str(via_home)],
+                             cwd=ROOT, capture_output=True, text=True, check=True).stdout
+        runs.append(json.loads(out.strip().splitlines()[-1]))
+    return {
+        'first_ms': round(statistics.median(r['first_s'] for r in runs) * 1e3, 1),
+        'rerun_ms': round(statistics.median(r['rerun_s'] for r in runs) * 1e3, 1),
+        'modules_imported': runs[0]['modules_imported'], 'heavy': runs[0]['heavy'], 'errors': runs[0]['errors'],
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5, help="fresh processes per page; the median is kept")
+    parser.add_argument('--reruns', type=int, default=5, help="warm reruns timed after the first run")
+    parser.add_argument('--via-home', type=float, nargs='?', const=3.0, default=0.0, metavar='SECONDS',
+                        help="run main.py first and wait this long (default 3s) before the page")
+    parser.add_argument('--out', type=Path, default=ROOT / "benchmarks" / "results" / "cold_start.json")
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.child:
+        child(args.child, args.reruns, args.via_home)
+        return 0
+
+    results = {}
+    print(f"{'Page':<34} {'First run':>10} {'Rerun':>9} {'Modules':>8}  Heavy imports")
+    for script in SCRIPTS:
+        r = results[script] = measure(script, args.repeat, args.reruns, args.via_home)
+        print(f"{script:<34} {r['first_ms']:>7.1f} ms {r['rerun_ms']:>6.1f} ms {r['modules_imported']:>8}  "
+              f"{', '.join(r['heavy']) or '-'}{'  ERROR' if r['errors'] else ''}")
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    args.out.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    print(f"\nResults written to {args.out}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,319 @@
+"""Headless benchmark suite for the simulator algorithms.
+
+Times the CPU schedulers, memory allocation strategies, file allocation methods and
+disk schedulers at input sizes from 10 up to --max-size, records wall time and peak
+traced memory, fits an empirical complexity curve per case and writes everything to
+JSON. With --baseline, any case that got slower or whose peak memory grew compared with
+the saved run is flagged and the script exits non-zero.
+
+    python benchmarks/run_benchmarks.py                       # full run
+    python benchmarks/run_benchmarks.py --only disk --max-size 100000
+    python benchmarks/run_benchmarks.py --save-baseline        # record benchmarks/baseline.json
+    python benchmarks/run_benchmarks.py --baseline benchmarks/baseline.json
+    python benchmarks/run_benchmarks.py --verify               # consistency checks only
+
+--verify runs no timings. It checks that the vectorised batch sweep in the I/O page
+still gives the same totals as run_disk_scheduling for every algorithm and direction
+on random queues, and exits non-zero on any mismatch.
+"""
+import argparse
+import ast
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+PAGES = ROOT / "pages"
+SIZES = [10, 100, 1_000, 10_000, 100_000, 1_000_000]
+
+# ============== PAGE LOADING ==============
+
+def load_page(filename):
+    # Pages run their UI at import time, so only the imports, functions, classes and
+    # UPPER_CASE constants are executed. `st` is replaced by a bare session_state holder
+    # and the Streamlit-only `core` helpers are left out.
+    path = PAGES / filename
+    tree = ast.parse(path.read_text(encoding="utf-8"))
+    keep = []
+    for node in tree.body:
+        if isinstance(node, ast.Import) and any(a.name.split('.')[0] == 'streamlit' for a in node.names):
+            continue
+        if isinstance(node, ast.ImportFrom) and (node.module or '').split('.')[0] == 'core':
+            continue
+        if isinstance(node, (ast.Import, ast.ImportFrom, ast.FunctionDef, ast.ClassDef)):
+            keep.append(node)
+        elif isinstance(node, ast.Assign):
+            targets = node.targets[0].elts if isinstance(node.targets[0], ast.Tuple) else node.targets
+            if all(isinstance(t, ast.Name) and t.id.isupper() for t in targets):
+                keep.append(node)
+    ns = {'st': SimpleNamespace(session_state=SimpleNamespace()), '__name__': f"bench_{path.stem}", '__file__': str(path)}
+    exec(compile(ast.Module(keep, type_ignores=[]), str(path), 'exec'), ns)
+    return ns
+
+# ============== CASES ==============
+# Each case maps a size n to (setup, run): setup builds fresh input outside the timer,
+# run(state) is the measured call.
+
+def cpu_cases():
+    ns = load_page("1_Process_Management.py")
+
+    def make(n):
+        rng = random.Random(n)
+        return [{'name': f"P{i}", 'arrival': rng.randint(0, n), 'burst': rng.randint(1, 20), 'priority': 1}
+                for i in range(n)]
+
+    return {
+        'cpu.fcfs': lambda n: (lambda: make(n), ns['fcfs_scheduling']),
+        'cpu.sjf': lambda n: (lambda: make(n), ns['sjf_scheduling']),
+        'cpu.round_robin': lambda n: (lambda: make(n), lambda p: ns['round_robin_scheduling'](p, 4)),
+    }
+
+def memory_cases():
+    ns = load_page("2_Memory_Management.py")
+
+    def make(n):
+        rng = random.Random(n)
+        return [{'id': i, 'size': rng.randint(10, 1000), 'status': 'Free', 'process': None,
+                 'allocated_size': 0, 'internal_frag': 0} for i in range(n)]
+
+    def case(method):
+        return lambda n: (lambda: make(n), lambda blocks: ns['allocate_memory'](blocks, 500, "P1", method))
+
+    return {f"memory.{m.lower().replace(' ', '_')}": case(m) for m in ["First Fit", "Best Fit", "Worst Fit"]}
+
+def filesystem_cases():
+    ns = load_page("3_File_Systems.py")
+    session = ns['st'].session_state
+    root = ns['ROOT_INO']
+
+    def make(n):
+        # A half-full disk with free space scattered in short runs
+        owner = np.full(n, ns['FREE'], dtype=np.int64)
+        owner[np.random.default_rng(n).random(n) < 0.5] = 1
+        session.files = {}
+        session.directories = {root: {'name': '/', 'parent': None, 'children': {}, 'created': ''}}
+        session.next_ino = 2
+        session.disk_blocks = n
+        session.block_owner = owner
+
+    def case(method):
+        return lambda n: (lambda: make(n), lambda _: ns['allocate_file']("bench.bin", 8, method, "/bench"))
+
+    return {f"filesystem.{m.lower()}": case(m) for m in ["Indexed", "Contiguous", "Linked"]}
+
+def disk_cases():
+    ns = load_page("4_IO_Systems.py")
+
+    def make(n):
+        rng = random.Random(n)
+        return [rng.randint(0, 199) for _ in range(n)]
+
+    def case(algo):
+        return lambda n: (lambda: make(n), lambda reqs: ns['run_disk_scheduling'](reqs, 53, algo))
+
+    return {f"disk.{a.lower()}": case(a) for a in ns['DISK_ALGORITHMS']}
+
+# ============== MEASUREMENT ==============
+
+def measure(setup, run, repeat, min_time=0.02):
+    # Best of `repeat` timings; each timing loops until it covers min_time so that
+    # microsecond calls are not lost in timer resolution.
+    best = float('inf')
+    for _ in range(repeat):
+        loops, elapsed = 0, 0.0
+        while elapsed < min_time:
+            state = setup()
+            start = time.perf_counter()
+            run(state)
+            elapsed += time.perf_counter() - start
+            loops += 1
+        best = min(best, elapsed / loops)
+    state = setup()
+    tracemalloc.start()
+    run(state)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak
+
+COMPLEXITY_MODELS = {
+    'O(1)': lambda n: np.ones_like(n),
+    'O(log n)': np.log,
+    'O(n)': lambda n: n,
+    'O(n log n)': lambda n: n * np.log(n),
+    'O(n^2)': lambda n: n ** 2,
+    'O(n^3)': lambda n: n ** 3,
+}
+
+def fit_complexity(sizes, times):
+    # Least-squares fit of t = a + b*f(n) for each model, scored on relative error so
+    # the large sizes do not drown out the small ones. Timer noise lets a steeper model
+    # shave a little error off a flat curve, so the simplest model within ~10% RMS
+    # relative error of the best one wins. Also returns the log-log slope.
+    if len(sizes) < 3:
+        return None, None
+    n = np.asarray(sizes, dtype=float)
+    t = np.asarray(times, dtype=float)
+    errors = {}
+    for name, f in COMPLEXITY_MODELS.items():
+        basis = np.column_stack([np.ones_like(n), f(n)]) / t[:, None]
+        coef, *_ = np.linalg.lstsq(basis, np.ones_like(t), rcond=None)
+        if coef[1] >= 0 or name == 'O(1)':
+            errors[name] = np.sqrt(np.mean((basis @ coef - 1) ** 2))
+    tolerance = min(errors.values()) + 0.1
+    best = next(name for name, err in errors.items() if err <= tolerance)
+    slope = float(np.polyfit(np.log(n), np.log(t), 1)[0])
+    return best, round(slope, 3)
+
+def run_case(name, factory, sizes, repeat, budget):
+    result = {'sizes': [], 'time_s': [], 'peak_kb': []}
+    for n in sizes:
+        if len(result['sizes']) >= 2:
+            # Extrapolate from the last two sizes and skip anything predicted to blow the budget
+            (n0, n1), (t0, t1) = result['sizes'][-2:], result['time_s'][-2:]
+            slope = max(1.0, np.log(t1 / t0) / np.log(n1 / n0))
+            if t1 * (n / n1) ** slope > budget:
+                result['truncated_at'] = n1
+                break
+        setup, run = factory(n)
+        t, peak = measure(setup, run, repeat)
+        result['sizes'].append(n)
+        result['time_s'].append(t)
+        result['peak_kb'].append(round(peak / 1024, 1))
+        print(f"  {name:<24} n={n:<9,} {t * 1e3:>11.3f} ms  {peak / 1024:>11.1f} KB", flush=True)
+    result['complexity'], result['exponent'] = fit_complexity(result['sizes'], result['time_s'])
+    return result
+
+# ============== CONSISTENCY CHECKS ==============
+
+def verify_disk_sweep(trials=300, seed=0):
+    # Small disks and short queues make ties, duplicates and requests at the head or the
+    # disk edges common, which is where the closed forms are most likely to drift
+    ns = load_page("4_IO_Systems.py")
+    rng = random.Random(seed)
+    mismatches = []
+    for _ in range(trials):
+        disk_size = rng.choice([8, 31, 200])
+        n = rng.randint(0, 12)
+        queues = [[rng.randrange(disk_size) for _ in range(n)] for _ in range(rng.randint(1, 6))]
+        heads = sorted(rng.sample(range(disk_size), min(disk_size, 5)))
+        for algo in ns['DISK_ALGORITHMS']:
+            for direction in ("right", "left"):
+                totals = ns['sweep_seek_totals'](queues, heads, algo, disk_size, direction)
+                for qi, q in enumerate(queues):
+                    for hi, h in enumerate(heads):
+                        expected = ns['run_disk_scheduling'](q, h, algo, disk_size, direction)[1]
+                        if totals[qi, hi] != expected:
+                            mismatches.append({'algorithm': algo, 'direction': direction, 'disk_size': disk_size,
+                                               'queue': q, 'head': h, 'sweep': int(totals[qi, hi]), 'expected': expected})
+    return mismatches
+
+# ============== REGRESSIONS ==============
+
+def compare(results, baseline, threshold, mem_threshold=None, floor=1e-4, mem_floor_kb=64):
+    # Wall time and peak traced memory per size; tiny values are skipped as noise
+    mem_threshold = threshold if mem_threshold is None else mem_threshold
+    flagged = []
+    for name, cur in results.items():
+        base = baseline.get('results', {}).get(name)
+        if not base:
+            continue
+        base_times = dict(zip(base['sizes'], base['time_s']))
+        base_peaks = dict(zip(base['sizes'], base.get('peak_kb', [])))
+        for n, t, kb in zip(cur['sizes'], cur['time_s'], cur['peak_kb']):
+            b = base_times.get(n)
+            if b is not None and max(t, b) >= floor and t > b * (1 + threshold):
+                flagged.append({'case': name, 'size': n, 'metric': 'time', 'baseline': b, 'current': t,
+                                'ratio': round(t / b, 2)})
+            b = base_peaks.get(n)
+            if b is not None and max(kb, b) >= mem_floor_kb and kb > b * (1 + mem_threshold):
+                flagged.append({'case': name, 'size': n, 'metric': 'memory', 'baseline': b, 'current': kb,
+                                'ratio': round(kb / max(b, 1e-9), 2)})
+    return flagged
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--max-size', type=int, default=SIZES[-1], help="largest input size (default 10^6)")
+    parser.add_argument('--budget', type=float, default=5.0, help="skip sizes where one call is predicted to exceed this many seconds")
+    parser.add_argument('--repeat', type=int, default=3, help="timings per size; the best is kept")
+    parser.add_argument('--only', action='append', default=[], help="run cases whose name contains this (repeatable)")
+    parser.add_argument('--out', type=Path, default=ROOT / "benchmarks" / "results" / "latest.json")
+    parser.add_argument('--baseline', type=Path, help="flag cases slower or hungrier than this saved run")
+    parser.add_argument('--threshold', type=float, default=0.25, help="allowed slowdown before flagging (0.25 = 25%%)")
+    parser.add_argument('--mem-threshold', type=float, help="allowed peak memory growth before flagging (default: --threshold)")
+    parser.add_argument('--save-baseline', action='store_true', help="also write the results to benchmarks/baseline.json")
+    parser.add_argument('--verify', action='store_true', help="only check that the batch sweep matches run_disk_scheduling")
+    args = parser.parse_args(argv)
+
+    if args.verify:
+        mismatches = verify_disk_sweep()
+        for m in mismatches[:10]:
+            print(f"  {m['algorithm']:<7} {m['direction']:<5} disk {m['disk_size']:<3} head {m['head']:<3} "
+                  f"queue {m['queue']}: sweep {m['sweep']}, run_disk_scheduling {m['expected']}")
+        print(f"Batch sweep vs run_disk_scheduling: {len(mismatches)} mismatch(es)")
+        return 1 if mismatches else 0
+
+    cases = {**cpu_cases(), **memory_cases(), **filesystem_cases(), **disk_cases()}
+    if args.only:
+        cases = {k: v for k, v in cases.items() if any(o in k for o in args.only)}
+    sizes = [n for n in SIZES if n <= args.max_size]
+
+    results = {}
+    for name, factory in cases.items():
+        results[name] = run_case(name, factory, sizes, args.repeat, args.budget)
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'), 'commit': git_commit(),
+            'python': platform.python_version(), 'numpy': np.__version__, 'platform': platform.platform(),
+            'repeat': args.repeat, 'budget_s': args.budget,
+        },
+        'results': results,
+    }
+
+    print("\nComplexity fits:")
+    for name, r in results.items():
+        print(f"  {name:<24} {r['complexity'] or '-':<11} slope {r['exponent'] if r['exponent'] is not None else '-'}")
+
+    exit_code = 0
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        report['regressions'] = compare(results, baseline, args.threshold, args.mem_threshold)
+        if report['regressions']:
+            exit_code = 1
+            print(f"\n{len(report['regressions'])} regression(s) against {args.baseline}:")
+            for r in report['regressions']:
+                if r['metric'] == 'time':
+                    change = f"{r['baseline'] * 1e3:.3f} ms -> {r['current'] * 1e3:.3f} ms"
+                else:
+                    change = f"{r['baseline']:.1f} KB -> {r['current']:.1f} KB peak"
+                print(f"  {r['case']:<24} n={r['size']:<9,} {change} (x{r['ratio']})")
+        else:
+            print(f"\nNo regressions against {args.baseline}")
+
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    args.out.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"\nResults written to {args.out}")
+    if args.save_baseline:
+        baseline_path = ROOT / "benchmarks" / "baseline.json"
+        baseline_path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"Baseline written to {baseline_path}")
+    return exit_code
+
+if __name__ == '__main__':
+    sys.exit(main())
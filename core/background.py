@@ -0,0 +1,120 @@
+"""Background simulation jobs for the simulator pages.
+
+A page starts a BackgroundJob and keeps it in st.session_state, so the run survives
+reruns and page switches. Algorithms take an optional `job` and call job.checkpoint()
+from their main loop; that is where partial results are published and cancellation
+takes effect. job_monitor() polls the job from a fragment, and finished_job() hands
+the result back to the page once it is done.
+"""
+import threading
+import time
+
+import streamlit as st
+
+class JobCancelled(Exception):
+    pass
+
+class BackgroundJob:
+    def __init__(self, label, target, *args, publish_every=0.1, **kwargs):
+        self.label = label
+        self.status = 'running'            # running | done | cancelled | error
+        self.progress = 0.0
+        self.partial = None
+        self.result = None
+        self.error = None
+        self.publish_every = publish_every
+        self.started = time.perf_counter()
+        self.finished = None
+        self._stage = (0, 1)
+        self._published = 0.0
+        self._cancel = threading.Event()
+        # A thread rather than a process: the results are large Python/numpy objects that
+        # would otherwise be pickled back, and numpy kernels release the GIL anyway
+        self._thread = threading.Thread(target=self._run, args=(target, args, kwargs),
+                                        name=f"sim-{label}", daemon=True)
+        self._thread.start()
+
+    def _run(self, target, args, kwargs):
+        try:
+            self.result = target(*args, job=self, **kwargs)
+            self.progress = 1.0
+            self.status = 'done'
+        except JobCancelled:
+            self.status = 'cancelled'
+        except Exception as e:
+            self.error = e
+            self.status = 'error'
+        self.finished = time.perf_counter()
+
+    @property
+    def running(self):
+        return self.status == 'running'
+
+    @property
+    def elapsed(self):
+        return (self.finished or time.perf_counter()) - self.started
+
+    def cancel(self):
+        self._cancel.set()
+
+    # ---- called from the worker thread ----
+
+    def stage(self, index, count):
+        # Splits the progress bar into `count` equal parts for multi-step runs
+        self._stage = (index, count)
+
+    def checkpoint(self, fraction, snapshot=None):
+        # Cheap enough to call every iteration: the snapshot callable only runs when a
+        # publish is due, so partial results are copied a few times a second at most
+        if self._cancel.is_set():
+            raise JobCancelled
+        now = time.perf_counter()
+        if now - self._published < self.publish_every:
+            return
+        index, count = self._stage
+        self.progress = (index + min(fraction, 1.0)) / count
+        if snapshot is not None:
+            self.partial = snapshot()
+        self._published = now
+
+    def publish(self, partial):
+        if self._cancel.is_set():
+            raise JobCancelled
+        self.partial = partial
+
+# ============== PAGE HELPERS ==============
+
+def start_job(key, label, target, *args, **kwargs):
+    previous = st.session_state.get(key)
+    if previous is not None and previous.running:
+        previous.cancel()
+    st.session_state[key] = BackgroundJob(label, target, *args, **kwargs)
+
+def finished_job(key):
+    # Returns the job once if it completed; cancelled or failed runs are reported and dropped
+    job = st.session_state.get(key)
+    if job is None or job.running:
+        return None
+    st.session_state[key] = None
+    if job.status == 'cancelled':
+        st.toast(f"{job.label} cancelled after {job.elapsed:.1f}s")
+    elif job.status == 'error':
+        st.toast(f"{job.label} failed: {job.error}", icon="⚠️")
+    return job if job.status == 'done' else None
+
+def job_monitor(key, render_partial=None, run_every=0.5):
+    @st.fragment(run_every=run_every)
+    def monitor():
+        job = st.session_state.get(key)
+        if job is None or not job.running:
+            # Hand over to a full rerun so the page picks the result up via finished_job()
+            st.rerun()
+        p1, p2 = st.columns([4, 1])
+        p1.progress(job.progress, text=f"{job.label}: {job.progress:.0%} · {job.elapsed:.1f}s")
+        if p2.button("⏹ Cancel", key=f"{key}_cancel", use_container_width=True):
+            job.cancel()
+        if render_partial is not None and job.partial is not None:
+            render_partial(job.partial)
+
+    if st.session_state.get(key) is not None:
+        monitor()
@@ -0,0 +1,229 @@
+"""Opt-in per-rerun profiler shared by the simulator pages.
+
+Each page calls start_profiling() right after set_page_config, wraps its work in
+prof.phase("..."), adds profiling_controls() to the sidebar and finishes with
+render_profile_panel(prof). With profiling off, phase() is a shared no-op context.
+"""
+import cProfile
+import io
+import json
+import pstats
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import nullcontext
+from datetime import datetime
+
+import streamlit as st
+from streamlit.delta_generator import DeltaGenerator
+
+_local = threading.local()
+_NULL_PHASE = nullcontext()
+UNATTRIBUTED = "(outside phases)"
+
+# ============== ELEMENT HOOKS ==============
+# Every element and container goes through DeltaGenerator._enqueue / _block, including
+# the bound st.* shortcuts, so wrapping those two methods once counts everything.
+
+def _count(kind, proto=None):
+    prof = getattr(_local, 'active', None)
+    if prof is None:
+        return
+    prof.elements[kind] += 1
+    if prof._phase is not None:
+        prof._phase['elements'] += 1
+    if kind == 'plotly_chart' and proto is not None:
+        traces = len(json.loads(proto.spec or '{}').get('data', []))
+        prof.traces += traces
+        if prof._phase is not None:
+            prof._phase['traces'] += traces
+
+def _install_hooks():
+    if getattr(DeltaGenerator, '_os_sim_profiled', False):
+        return
+    enqueue, block = DeltaGenerator._enqueue, DeltaGenerator._block
+
+    def _enqueue(self, delta_type, element_proto, *args, **kwargs):
+        _count(delta_type, element_proto)
+        return enqueue(self, delta_type, element_proto, *args, **kwargs)
+
+    def _block(self, *args, **kwargs):
+        _count('container')
+        return block(self, *args, **kwargs)
+
+    DeltaGenerator._enqueue, DeltaGenerator._block = _enqueue, _block
+    DeltaGenerator._os_sim_profiled = True
+
+# ============== RUN PROFILER ==============
+
+class _Phase:
+    __slots__ = ('prof', 'name', 'start', 'outer')
+
+    def __init__(self, prof, name):
+        self.prof, self.name = prof, name
+
+    def __enter__(self):
+        self.outer = self.prof._phase
+        self.prof._phase = self.prof.phases.setdefault(
+            self.name, {'calls': 0, 'seconds': 0.0, 'elements': 0, 'traces': 0})
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        entry = self.prof._phase
+        entry['seconds'] += time.perf_counter() - self.start
+        entry['calls'] += 1
+        self.prof._phase = self.outer
+        return False
+
+class RunProfiler:
+    def __init__(self, page, enabled=False, cprofile=False, memory=False):
+        self.page, self.enabled, self.memory = page, enabled, memory
+        self.phases = {}
+        self.elements = Counter()
+        self.traces = 0
+        self._phase = None
+        self._cprofile = None
+        self._own_tracemalloc = False
+        self.notes = []
+        self.start = time.perf_counter()
+        if not enabled:
+            return
+        if memory:
+            if tracemalloc.is_tracing():
+                self.notes.append("tracemalloc was already running; peak covers other sessions too.")
+            else:
+                tracemalloc.start()
+                self._own_tracemalloc = True
+            tracemalloc.reset_peak()
+        if cprofile:
+            self._cprofile = cProfile.Profile()
+            try:
+                self._cprofile.enable()
+            except ValueError:
+                # Python 3.12+ allows one profiler per process
+                self._cprofile = None
+                self.notes.append("cProfile skipped: another profiler is active.")
+
+    def phase(self, name):
+        # Phases nest: an inner phase's time also counts toward the outer one, its elements do not
+        if not self.enabled:
+            return _NULL_PHASE
+        return _Phase(self, name)
+
+    def stop(self, collect=True):
+        total = time.perf_counter() - self.start
+        profile_text, memory = None, None
+        if self._cprofile is not None:
+            self._cprofile.disable()
+        if not collect:
+            self._cprofile = None
+            if self._own_tracemalloc:
+                tracemalloc.stop()
+                self._own_tracemalloc = False
+            return total, None, None
+        if self._cprofile is not None:
+            out = io.StringIO()
+            pstats.Stats(self._cprofile, stream=out).sort_stats('cumulative').print_stats(25)
+            profile_text = out.getvalue()
+            self._cprofile = None
+        if self.memory and tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot().filter_traces([
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+            ])
+            current, peak = tracemalloc.get_traced_memory()
+            memory = {
+                'current_kb': round(current / 1024, 1), 'peak_kb': round(peak / 1024, 1),
+                'top': [{'Location': str(s.traceback[0]), 'Size (KB)': round(s.size / 1024, 1), 'Blocks': s.count}
+                        for s in snapshot.statistics('lineno')[:15]],
+            }
+            if self._own_tracemalloc:
+                tracemalloc.stop()
+                self._own_tracemalloc = False
+        return total, profile_text, memory
+
+    def report(self):
+        total, profile_text, memory = self.stop()
+        in_phases = sum(self.elements.values()) - sum(p['elements'] for p in self.phases.values())
+        phases = [{'Phase': name, 'Calls': p['calls'], 'Time (ms)': round(p['seconds'] * 1e3, 3),
+                   'Share': p['seconds'] / total if total else 0.0,
+                   'Elements': p['elements'], 'Plotly Traces': p['traces']}
+                  for name, p in self.phases.items()]
+        if in_phases > 0:
+            phases.append({'Phase': UNATTRIBUTED, 'Calls': 1, 'Time (ms)': None, 'Share': None,
+                           'Elements': in_phases, 'Plotly Traces': None})
+        return {
+            'page': self.page, 'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'total_ms': round(total * 1e3, 3), 'elements_total': sum(self.elements.values()),
+            'elements_by_type': dict(self.elements.most_common()), 'plotly_traces': self.traces,
+            'phases': phases, 'cprofile': profile_text, 'tracemalloc': memory, 'notes': self.notes,
+        }
+
+def _abandon_stale_run():
+    # st.rerun() and st.switch_page() abort the script before render_profile_panel,
+    # which would leave cProfile/tracemalloc running on this thread
+    stale = getattr(_local, 'active', None)
+    if stale is not None:
+        stale.stop(collect=False)
+    _local.active = None
+
+def start_profiling(page):
+    _abandon_stale_run()
+    if 'profiling' not in st.session_state:
+        st.session_state.profiling = {'enabled': False, 'cprofile': False, 'memory': False}
+    if 'profile_reports' not in st.session_state: st.session_state.profile_reports = {}
+    opts = st.session_state.profiling
+    prof = RunProfiler(page, opts['enabled'], opts['cprofile'], opts['memory'])
+    if prof.enabled:
+        _install_hooks()
+        _local.active = prof
+    return prof
+
+# ============== SIDEBAR & PANEL ==============
+
+def _sync_option(name):
+    st.session_state.profiling[name] = st.session_state[f"_profiling_{name}"]
+
+def profiling_controls():
+    # Widget keys are dropped when the user switches page, so the settings live in
+    # st.session_state.profiling and the widgets are re-seeded from it on each run
+    opts = st.session_state.profiling
+    labels = {'enabled': "⏱️ Profile reruns", 'cprofile': "cProfile snapshot", 'memory': "tracemalloc snapshot"}
+    for name, label in labels.items():
+        if name != 'enabled' and not opts['enabled']:
+            continue
+        st.session_state[f"_profiling_{name}"] = opts[name]
+        st.toggle(label, key=f"_profiling_{name}", on_change=_sync_option, args=(name,))
+
+def render_profile_panel(prof):
+    if not prof.enabled:
+        return
+    report = prof.report()
+    _local.active = None
+    st.session_state.profile_reports[prof.page] = report
+
+    import pandas as pd
+
+    with st.expander(f"⏱️ Profiler: last run {report['total_ms']:.1f} ms", expanded=False):
+        m1, m2, m3, m4 = st.columns(4)
+        m1.metric("Script time", f"{report['total_ms']:.1f} ms")
+        m2.metric("Elements", report['elements_total'])
+        m3.metric("Plotly traces", report['plotly_traces'])
+        if report['tracemalloc']:
+            m4.metric("Peak traced", f"{report['tracemalloc']['peak_kb']:,.0f} KB")
+        for note in report['notes']:
+            st.caption(note)
+
+        st.dataframe(pd.DataFrame(report['phases']), use_container_width=True, hide_index=True,
+                     column_config={'Share': st.column_config.ProgressColumn("Share", min_value=0.0, max_value=1.0, format="percent")})
+        if report['elements_by_type']:
+            st.dataframe(pd.DataFrame(list(report['elements_by_type'].items()), columns=['Element', 'Count']),
+                         use_container_width=True, hide_index=True)
+        if report['cprofile']:
+            st.code(report['cprofile'], language=None)
+        if report['tracemalloc']:
+            st.dataframe(pd.DataFrame(report['tracemalloc']['top']), use_container_width=True, hide_index=True)
+
+        st.download_button("Export JSON", json.dumps(st.session_state.profile_reports, indent=2),
+                           file_name="profile_reports.json", mime="application/json", use_container_width=True)
@@ -0,0 +1,29 @@
+"""Process-wide singletons, created once per server process with st.cache_resource."""
+import importlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+
+# pandas (which pulls in pyarrow) is most of a cold page's first run. Pages import
+# these where a table or figure is drawn; the warm-up loads them ahead of that.
+HEAVY_MODULES = ("pandas", "pyarrow", "plotly.graph_objects")
+
+def _import_heavy_modules():
+    for name in HEAVY_MODULES:
+        importlib.import_module(name)
+    go = importlib.import_module("plotly.graph_objects")
+    go.Figure(go.Bar(x=[0], y=[0])).to_json()      # loads the default template and validators
+
+@st.cache_resource(show_spinner=False)
+def warm_up_imports(delay=1.0):
+    # Starts after `delay` so the import work does not compete for the GIL with the
+    # first page's own run; by the time a visitor opens a module it is usually done.
+    timer = threading.Timer(delay, _import_heavy_modules)
+    timer.daemon = True
+    timer.start()
+    return timer
+
+@st.cache_resource(show_spinner=False)
+def worker_pool(workers):
+    return ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"sweep{workers}")
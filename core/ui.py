@@ -0,0 +1,107 @@
+"""Shared page frame: page config, stylesheet and sidebar for main.py and every page."""
+import streamlit as st
+
+from core.profiling import start_profiling, profiling_controls
+from core.resources import warm_up_imports
+
+# One stylesheet for the whole app. st.html sends style-only content to the event
+# container, so unlike st.markdown it takes no space in the page layout. The brand
+# colour for Streamlit's own widgets lives in .streamlit/config.toml, which the browser
+# receives once per session instead of on every rerun.
+STYLESHEET = """
+<style>
+    :root {
+        --primary: #2563eb;
+        --primary-dark: #1d4ed8;
+        --secondary: #475569;
+        --accent: #0891b2;
+        --background: #f8fafc;
+        --surface: #ffffff;
+        --text-primary: #1e293b;
+        --text-secondary: #64748b;
+        --border: #e2e8f0;
+        --allocated: #3b82f6;
+        --free: #22c55e;
+        --fragmented: #ef4444;
+        --file-blue: #3b82f6;
+        --file-green: #10b981;
+        --index-block: #ef4444;
+    }
+
+    .main-header {
+        background: linear-gradient(135deg, var(--primary) 0%, var(--primary-dark) 100%);
+        padding: 2.5rem;
+        border-radius: 12px;
+        color: white;
+        margin-bottom: 2rem;
+        box-shadow: 0 4px 6px -1px rgb(0 0 0 / 0.1);
+    }
+
+    .stat-card {
+        background: var(--surface);
+        border: 1px solid var(--border);
+        border-radius: 8px;
+        padding: 1.5rem;
+        text-align: center;
+        transition: transform 0.2s;
+    }
+    .stat-card:hover { transform: translateY(-5px); }
+
+    .stat-value { font-size: 2rem; font-weight: 700; color: var(--primary); }
+    .stat-label { font-size: 0.8rem; color: var(--text-secondary); text-transform: uppercase; letter-spacing: 0.05em; }
+
+    .tag {
+        display: inline-block;
+        background-color: #f1f5f9;
+        color: var(--secondary);
+        font-size: 0.75rem;
+        font-weight: 500;
+        padding: 4px 10px;
+        border-radius: 6px;
+        margin-right: 5px;
+        margin-bottom: 5px;
+        border: 1px solid var(--border);
+    }
+
+    .metric-box, .metric-card {
+        background: linear-gradient(135deg, #1e293b 0%, #0f172a 100%);
+        color: white;
+        padding: 1.25rem;
+        border-radius: 8px;
+        text-align: center;
+        border: 1px solid #334155;
+    }
+    .metric-value { font-size: 1.5rem; font-weight: 700; color: #3b82f6; }
+    .metric-label { font-size: 0.7rem; color: #94a3b8; text-transform: uppercase; }
+
+    .metric-card.large {
+        background: linear-gradient(135deg, #1f2937 0%, #111827 100%);
+        padding: 1.5rem;
+        border-radius: 12px;
+        border: 1px solid #374151;
+    }
+    .metric-card.large .metric-value { font-size: 2rem; font-weight: 800; }
+    .metric-card.large .metric-label { font-size: 0.75rem; color: #9ca3af; }
+</style>
+"""
+
+def setup_page(title, module=None):
+    # Must run first on every page. Returns the run profiler for the page's phases.
+    st.set_page_config(page_title=title, layout="wide", initial_sidebar_state="expanded")
+    prof = start_profiling(module or "Home")
+    with prof.phase("page frame"):
+        st.html(STYLESHEET)
+        with st.sidebar:
+            st.title("OS Simulator")
+            if module is None:
+                st.caption("Version 2.0 | Educational Platform")
+                st.divider()
+                st.info("Select a module from the dashboard to begin your simulation.")
+            else:
+                if st.button("🏠 Back to Home", use_container_width=True):
+                    st.switch_page("main.py")
+                st.divider()
+                st.caption(f"Module: {module}")
+            profiling_controls()
+    warm_up_imports()
+    return prof
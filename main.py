@@ -1,70 +1,9 @@
 import streamlit as st
+from core.profiling import render_profile_panel
+from core.ui import setup_page
 
 # Page configuration
-st.set_page_config(
-    page_title="OS Simulator - Home",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
-
-# Professional CSS styling (Global)
-st.markdown("""
-<style>
-    :root {
-        --primary: #2563eb;
-        --primary-dark: #1d4ed8;
-        --secondary: #475569;
-        --accent: #0891b2;
-        --background: #f8fafc;
-        --surface: #ffffff;
-        --text-primary: #1e293b;
-        --text-secondary: #64748b;
-        --border: #e2e8f0;
-    }
-    
-    .main-header {
-        background: linear-gradient(135deg, var(--primary) 0%, var(--primary-dark) 100%);
-        padding: 2.5rem;
-        border-radius: 12px;
-        color: white;
-        margin-bottom: 2rem;
-        box-shadow: 0 4px 6px -1px rgb(0 0 0 / 0.1);
-    }
-    
-    .stat-card {
-        background: var(--surface);
-        border: 1px solid var(--border);
-        border-radius: 8px;
-        padding: 1.5rem;
-        text-align: center;
-        transition: transform 0.2s;
-    }
-    .stat-card:hover { transform: translateY(-5px); }
-    
-    .stat-value { font-size: 2rem; font-weight: 700; color: var(--primary); }
-    .stat-label { font-size: 0.8rem; color: var(--text-secondary); text-transform: uppercase; letter-spacing: 0.05em; }
-    
-    .tag {
-        display: inline-block;
-        background-color: #f1f5f9;
-        color: var(--secondary);
-        font-size: 0.75rem;
-        font-weight: 500;
-        padding: 4px 10px;
-        border-radius: 6px;
-        margin-right: 5px;
-        margin-bottom: 5px;
-        border: 1px solid var(--border);
-    }
-</style>
-""", unsafe_allow_html=True)
-
-# SIDEBAR (Minimalist)
-with st.sidebar:
-    st.title("OS Simulator")
-    st.caption("Version 2.0 | Educational Platform")
-    st.divider()
-    st.info("Select a module from the dashboard to begin your simulation.")
+prof = setup_page("OS Simulator - Home")
 
 # HEADER
 st.markdown("""
@@ -112,21 +51,24 @@ modules = [
         "name": "I/O Systems",
         "desc": "Learn disk scheduling algorithms and analyze seek time optimization metrics.",
         "path": "pages/4_IO_Systems.py",
-        "tags": ["SSTF", "SCAN", "C-SCAN", "LOOK"],
+        "tags": ["SSTF", "SCAN", "C-SCAN", "LOOK", "C-LOOK"],
         "icon": "💿"
     }
 ]
 
-for i, mod in enumerate(modules):
-    target_col = m_col1 if i % 2 == 0 else m_col2
-    with target_col:
-        with st.container(border=True):
-            st.subheader(f"{mod['icon']} {mod['name']}")
-            st.write(mod['desc'])
-            tag_html = "".join([f'<span class="tag">{t}</span>' for t in mod['tags']])
-            st.markdown(tag_html, unsafe_allow_html=True)
-            if st.button(f"Launch {mod['name']}", key=f"nav_{i}", use_container_width=True, type="primary"):
-                st.switch_page(mod['path'])
+with prof.phase("module grid"):
+    for i, mod in enumerate(modules):
+        target_col = m_col1 if i % 2 == 0 else m_col2
+        with target_col:
+            with st.container(border=True):
+                st.subheader(f"{mod['icon']} {mod['name']}")
+                st.write(mod['desc'])
+                tag_html = "".join([f'<span class="tag">{t}</span>' for t in mod['tags']])
+                st.markdown(tag_html, unsafe_allow_html=True)
+                if st.button(f"Launch {mod['name']}", key=f"nav_{i}", use_container_width=True, type="primary"):
+                    st.switch_page(mod['path'])
+
+render_profile_panel(prof)
 
 st.divider()
 st.caption("Developed as an Educational Platform for Operating System Concepts.")
\ No newline at end of file
@@ -1,44 +1,22 @@
 import streamlit as st
-import pandas as pd
-import plotly.graph_objects as go
 from datetime import datetime
 import copy
+from core.background import start_job, finished_job, job_monitor
+from core.profiling import render_profile_panel
+from core.ui import setup_page
 
 # Page configuration
-st.set_page_config(
-    page_title="Process Management - OS Simulator",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
-
-# Professional CSS Styling
-st.markdown("""
-<style>
-    :root {
-        --primary: #2563eb;
-        --text-primary: #1e293b;
-        --border: #e2e8f0;
-    }
-    .metric-box {
-        background: linear-gradient(135deg, #1e293b 0%, #0f172a 100%);
-        color: white;
-        padding: 1.25rem;
-        border-radius: 8px;
-        text-align: center;
-        border: 1px solid #334155;
-    }
-    .metric-value { font-size: 1.5rem; font-weight: 700; color: #3b82f6; }
-    .metric-label { font-size: 0.7rem; color: #94a3b8; text-transform: uppercase; }
-</style>
-""", unsafe_allow_html=True)
+prof = setup_page("Process Management - OS Simulator", "Process Management")
 
 # ============== CPU SCHEDULING ALGORITHMS ==============
 
-def fcfs_scheduling(processes):
+def fcfs_scheduling(processes, job=None):
     processes_sorted = sorted(processes, key=lambda x: x['arrival'])
     gantt, results, log = [], [], []
     current_time = 0
     for p in processes_sorted:
+        if job is not None:
+            job.checkpoint(len(results) / len(processes_sorted), lambda: (results[:], gantt[:]))
         if current_time < p['arrival']:
             gantt.append({'process': 'IDLE', 'start': current_time, 'end': p['arrival']})
             current_time = p['arrival']
@@ -53,11 +31,13 @@ def fcfs_scheduling(processes):
         current_time = end_time
     return results, gantt, log
 
-def sjf_scheduling(processes):
+def sjf_scheduling(processes, job=None):
     remaining = copy.deepcopy(processes)
     gantt, results, log = [], [], []
     current_time = 0
     while remaining:
+        if job is not None:
+            job.checkpoint(len(results) / len(processes), lambda: (results[:], gantt[:]))
         available = [p for p in remaining if p['arrival'] <= current_time]
         if not available:
             next_arr = min(p['arrival'] for p in remaining)
@@ -77,16 +57,24 @@ def sjf_scheduling(processes):
         current_time = end_time
     return results, gantt, log
 
-def round_robin_scheduling(processes, quantum):
+def round_robin_scheduling(processes, quantum, job=None):
     remaining = copy.deepcopy(processes)
     for p in remaining: p['rem'] = p['burst']
     gantt, log = [], []
     results_map = {p['name']: {'arr': p['arrival'], 'burst': p['burst'], 'fin': 0} for p in processes}
     current_time = 0
     ready_queue = []
+    finished = []
+
+    def row(name):
+        d = results_map[name]
+        tr = d['fin'] - d['arr']
+        return {'Process': name, 'Arrival': d['arr'], 'Burst': d['burst'], 'Waiting': tr - d['burst'], 'Turnaround': tr, 'Finish': d['fin']}
     
     remaining.sort(key=lambda x: x['arrival'])
     while remaining or ready_queue:
+        if job is not None:
+            job.checkpoint(len(finished) / len(processes), lambda: ([row(n) for n in finished], gantt[:]))
         while remaining and remaining[0]['arrival'] <= current_time:
             ready_queue.append(remaining.pop(0))
         
@@ -106,13 +94,47 @@ def round_robin_scheduling(processes, quantum):
             ready_queue.append(remaining.pop(0))
             
         if cp['rem'] > 0: ready_queue.append(cp)
-        else: results_map[cp['name']]['fin'] = current_time
+        else:
+            results_map[cp['name']]['fin'] = current_time
+            finished.append(cp['name'])
             
-    res = []
-    for name, d in results_map.items():
-        tr = d['fin'] - d['arr']
-        res.append({'Process': name, 'Arrival': d['arr'], 'Burst': d['burst'], 'Waiting': tr - d['burst'], 'Turnaround': tr, 'Finish': d['fin']})
-    return res, gantt, log
+    return [row(name) for name in results_map], gantt, log
+
+SCHEDULERS = {"FCFS": fcfs_scheduling, "SJF": sjf_scheduling, "Round Robin (RR)": round_robin_scheduling}
+
+# ============== GANTT CHART ==============
+
+def gantt_figure(gantt):
+    import plotly.graph_objects as go
+    # One bar trace for the whole chart: per-slice traces made long runs (and the partial
+    # chart redrawn on every progress poll) cost one Plotly trace per time slice
+    colors = ['#3b82f6', '#10b981', '#f59e0b', '#8b5cf6', '#ef4444']
+    names = [item['process'] for item in gantt]
+    fig = go.Figure(go.Bar(
+        x=[item['end'] - item['start'] for item in gantt], base=[item['start'] for item in gantt],
+        y=['CPU'] * len(gantt), orientation='h',
+        marker_color=[colors[i % len(colors)] if name != 'IDLE' else '#d1d5db' for i, name in enumerate(names)],
+        text=names if len(gantt) <= 200 else None, textposition='inside',
+        customdata=[[item['process'], item['start'], item['end']] for item in gantt],
+        hovertemplate='%{customdata[0]}<br>t=%{customdata[1]} to t=%{customdata[2]}<extra></extra>',
+    ))
+    fig.update_layout(barmode='stack', height=150, showlegend=False, margin=dict(l=10, r=10, t=10, b=30))
+    return fig
+
+def render_metrics(results, count, count_label="Total Processes"):
+    import pandas as pd
+    res_df = pd.DataFrame(results, columns=['Process', 'Waiting', 'Turnaround'])
+    avg_wait = res_df["Waiting"].mean() if len(res_df) else 0.0
+    avg_tat = res_df["Turnaround"].mean() if len(res_df) else 0.0
+    m1, m2, m3 = st.columns(3)
+    m1.markdown(f'<div class="metric-box"><div class="metric-value">{avg_wait:.2f}</div><div class="metric-label">Avg Waiting</div></div>', unsafe_allow_html=True)
+    m2.markdown(f'<div class="metric-box"><div class="metric-value">{avg_tat:.2f}</div><div class="metric-label">Avg Turnaround</div></div>', unsafe_allow_html=True)
+    m3.markdown(f'<div class="metric-box"><div class="metric-value">{count}</div><div class="metric-label">{count_label}</div></div>', unsafe_allow_html=True)
+
+def render_partial(partial):
+    results, gantt = partial
+    st.plotly_chart(gantt_figure(gantt), use_container_width=True)
+    render_metrics(results, len(results), "Completed")
 
 # ============== SESSION STATE ==============
 if 'processes' not in st.session_state:
@@ -122,14 +144,11 @@ if 'processes' not in st.session_state:
     ]
 if 'results' not in st.session_state: st.session_state.results = None
 if 'gantt' not in st.session_state: st.session_state.gantt = None
+if 'cpu_job' not in st.session_state: st.session_state.cpu_job = None
 
-# ============== SIDEBAR (Navigation Only) ==============
-with st.sidebar:
-    st.title("OS Simulator")
-    if st.button("🏠 Back to Home", use_container_width=True):
-        st.switch_page("main.py")
-    st.divider()
-    st.caption("Module: Process Management")
+done_job = finished_job('cpu_job')
+if done_job:
+    st.session_state.results, st.session_state.gantt, _ = done_job.result
 
 # ============== MAIN UI ==============
 st.title("⚡ CPU Scheduling Visualization")
@@ -147,14 +166,13 @@ with col_config:
         
         c1, c2 = st.columns(2)
         if c1.button("▶ Run Simulation", type="primary", use_container_width=True):
-            if algo == "FCFS":
-                st.session_state.results, st.session_state.gantt, _ = fcfs_scheduling(st.session_state.processes)
-            elif algo == "SJF":
-                st.session_state.results, st.session_state.gantt, _ = sjf_scheduling(st.session_state.processes)
-            else:
-                st.session_state.results, st.session_state.gantt, _ = round_robin_scheduling(st.session_state.processes, quantum)
+            # Runs in a worker thread; widget interaction while it runs no longer restarts it
+            args = (quantum,) if algo == "Round Robin (RR)" else ()
+            start_job('cpu_job', algo, SCHEDULERS[algo], list(st.session_state.processes), *args)
         
         if c2.button("🗑️ Reset", use_container_width=True):
+            if st.session_state.cpu_job: st.session_state.cpu_job.cancel()
+            st.session_state.cpu_job = None
             st.session_state.results = None
             st.session_state.gantt = None
             st.rerun()
@@ -176,7 +194,8 @@ st.divider()
 # TABLE & VISUALIZATION
 col_table, col_viz = st.columns([1, 2], gap="large")
 
-with col_table:
+with col_table, prof.phase("process table"):
+    import pandas as pd
     st.subheader("Process Queue")
     df = pd.DataFrame(st.session_state.processes)
     st.dataframe(df[['name', 'arrival', 'burst']], use_container_width=True, hide_index=True)
@@ -187,27 +206,22 @@ with col_table:
         st.rerun()
 
 with col_viz:
-    if st.session_state.gantt:
+    if st.session_state.cpu_job:
+        st.subheader("Gantt Chart (running)")
+        job_monitor('cpu_job', render_partial)
+    elif st.session_state.gantt:
         st.subheader("Gantt Chart")
         
-        fig = go.Figure()
-        colors = ['#3b82f6', '#10b981', '#f59e0b', '#8b5cf6', '#ef4444']
-        for i, item in enumerate(st.session_state.gantt):
-            fig.add_trace(go.Bar(
-                x=[item['end'] - item['start']], base=item['start'],
-                y=['CPU'], orientation='h', name=item['process'],
-                marker_color=colors[i % len(colors)] if item['process'] != 'IDLE' else '#d1d5db',
-                text=item['process'], textposition='inside'
-            ))
-        fig.update_layout(barmode='stack', height=150, showlegend=False, margin=dict(l=10, r=10, t=10, b=30))
-        st.plotly_chart(fig, use_container_width=True)
+        with prof.phase("gantt figure"):
+            fig = gantt_figure(st.session_state.gantt)
+        with prof.phase("gantt render"):
+            st.plotly_chart(fig, use_container_width=True)
         
         # Metrics
-        st.subheader("Performance Metrics")
-        res_df = pd.DataFrame(st.session_state.results)
-        m1, m2, m3 = st.columns(3)
-        m1.markdown(f'<div class="metric-box"><div class="metric-value">{res_df["Waiting"].mean():.2f}</div><div class="metric-label">Avg Waiting</div></div>', unsafe_allow_html=True)
-        m2.markdown(f'<div class="metric-box"><div class="metric-value">{res_df["Turnaround"].mean():.2f}</div><div class="metric-label">Avg Turnaround</div></div>', unsafe_allow_html=True)
-        m3.markdown(f'<div class="metric-box"><div class="metric-value">{len(st.session_state.processes)}</div><div class="metric-label">Total Processes</div></div>', unsafe_allow_html=True)
+        with prof.phase("metrics"):
+            st.subheader("Performance Metrics")
+            render_metrics(st.session_state.results, len(st.session_state.processes))
     else:
-        st.info("Configure the processes and click 'Run Simulation' to see results.")
\ No newline at end of file
+        st.info("Configure the processes and click 'Run Simulation' to see results.")
+
+render_profile_panel(prof)
\ No newline at end of file
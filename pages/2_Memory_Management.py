@@ -1,36 +1,11 @@
 import streamlit as st
-import pandas as pd
 from datetime import datetime
 import copy
+from core.profiling import render_profile_panel
+from core.ui import setup_page
 
 # Page configuration
-st.set_page_config(
-    page_title="Memory Management - OS Simulator",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
-
-# Professional CSS Styling
-st.markdown("""
-<style>
-    :root {
-        --primary: #2563eb;
-        --allocated: #3b82f6;
-        --free: #22c55e;
-        --fragmented: #ef4444;
-    }
-    .metric-card {
-        background: linear-gradient(135deg, #1e293b 0%, #0f172a 100%);
-        color: white;
-        padding: 1.25rem;
-        border-radius: 8px;
-        text-align: center;
-        border: 1px solid #334155;
-    }
-    .metric-value { font-size: 1.5rem; font-weight: 700; color: #3b82f6; }
-    .metric-label { font-size: 0.7rem; color: #94a3b8; text-transform: uppercase; }
-</style>
-""", unsafe_allow_html=True)
+prof = setup_page("Memory Management - OS Simulator", "Memory Management")
 
 # ============== MEMORY ALLOCATION ALGORITHMS ==============
 
@@ -86,14 +61,6 @@ if 'memory_blocks' not in st.session_state:
 if 'mem_log' not in st.session_state: st.session_state.mem_log = []
 if 'p_count' not in st.session_state: st.session_state.p_count = 1
 
-# ============== SIDEBAR (Navigation Only) ==============
-with st.sidebar:
-    st.title("OS Simulator")
-    if st.button("🏠 Back to Home", use_container_width=True):
-        st.switch_page("main.py")
-    st.divider()
-    st.caption("Module: Memory Management")
-
 # ============== MAIN UI ==============
 st.title("🧠 Memory Management & Allocation")
 
@@ -107,9 +74,10 @@ with ctrl_col1:
         p_name = st.text_input("Process Name", value=f"P{st.session_state.p_count}")
         p_size = st.number_input("Required Size (KB)", min_value=1, value=150)
         if st.button("Allocate", type="primary", use_container_width=True):
-            success, new_blocks, logs = allocate_memory(
-                copy.deepcopy(st.session_state.memory_blocks), p_size, p_name, method
-            )
+            with prof.phase("allocation"):
+                success, new_blocks, logs = allocate_memory(
+                    copy.deepcopy(st.session_state.memory_blocks), p_size, p_name, method
+                )
             st.session_state.mem_log = logs + st.session_state.mem_log
             if success:
                 st.session_state.memory_blocks = new_blocks
@@ -155,7 +123,7 @@ st.divider()
 # VISUALIZATION AREA
 vis_col1, vis_col2 = st.columns([1, 2], gap="large")
 
-with vis_col1:
+with vis_col1, prof.phase("ram map"):
     st.subheader("RAM Map Visualization")
     
     total_mem = sum(b['size'] for b in st.session_state.memory_blocks)
@@ -173,20 +141,25 @@ with vis_col1:
 
 with vis_col2:
     st.subheader("Fragmentation & Metrics")
-    m1, m2, m3 = st.columns(3)
-    
-    total_alloc = sum(b['allocated_size'] for b in st.session_state.memory_blocks)
-    total_frag = sum(b['internal_frag'] for b in st.session_state.memory_blocks)
-    util = (total_alloc / total_mem * 100) if total_mem > 0 else 0
-    
-    m1.markdown(f'<div class="metric-card"><div class="metric-value">{util:.1f}%</div><div class="metric-label">Utilization</div></div>', unsafe_allow_html=True)
-    m2.markdown(f'<div class="metric-card"><div class="metric-value" style="color:#ef4444">{total_frag}KB</div><div class="metric-label">Internal Frag</div></div>', unsafe_allow_html=True)
-    m3.markdown(f'<div class="metric-card"><div class="metric-value">{total_mem}KB</div><div class="metric-label">Total RAM</div></div>', unsafe_allow_html=True)
+    with prof.phase("metrics"):
+        m1, m2, m3 = st.columns(3)
+        
+        total_alloc = sum(b['allocated_size'] for b in st.session_state.memory_blocks)
+        total_frag = sum(b['internal_frag'] for b in st.session_state.memory_blocks)
+        util = (total_alloc / total_mem * 100) if total_mem > 0 else 0
+        
+        m1.markdown(f'<div class="metric-card"><div class="metric-value">{util:.1f}%</div><div class="metric-label">Utilization</div></div>', unsafe_allow_html=True)
+        m2.markdown(f'<div class="metric-card"><div class="metric-value" style="color:#ef4444">{total_frag}KB</div><div class="metric-label">Internal Frag</div></div>', unsafe_allow_html=True)
+        m3.markdown(f'<div class="metric-card"><div class="metric-value">{total_mem}KB</div><div class="metric-label">Total RAM</div></div>', unsafe_allow_html=True)
     
-    st.dataframe(pd.DataFrame(st.session_state.memory_blocks), use_container_width=True, hide_index=True)
+    with prof.phase("block table"):
+        import pandas as pd
+        st.dataframe(pd.DataFrame(st.session_state.memory_blocks), use_container_width=True, hide_index=True)
     
     st.subheader("System Log")
     st.code("\n".join(st.session_state.mem_log[:10]))
 
+render_profile_panel(prof)
+
 st.divider()
 st.caption("OS Simulator v2.0 | Memory Management Module")
\ No newline at end of file
@@ -1,111 +1,830 @@
 import streamlit as st
-import pandas as pd
+import numpy as np
+from collections import OrderedDict
 from datetime import datetime
+from itertools import islice
+import mmap
+import os
 import random
+import struct
+import tempfile
+from core.background import start_job, finished_job, job_monitor
+from core.profiling import render_profile_panel
+from core.ui import setup_page
 
 # Page configuration
-st.set_page_config(
-    page_title="File Systems - OS Simulator",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
-
-# Professional CSS Styling
-st.markdown("""
-<style>
-    :root {
-        --primary: #2563eb;
-        --file-blue: #3b82f6;
-        --file-green: #10b981;
-        --index-block: #ef4444;
-    }
-    .block-grid {
-        display: grid;
-        grid-template-columns: repeat(8, 1fr);
-        gap: 5px;
-        margin-top: 10px;
-    }
-    .disk-block {
-        aspect-ratio: 1;
-        border-radius: 4px;
-        display: flex;
-        align-items: center;
-        justify-content: center;
-        font-size: 10px;
-        font-weight: bold;
-        color: white;
-        border: 1px solid #e2e8f0;
-    }
-</style>
-""", unsafe_allow_html=True)
+prof = setup_page("File Systems - OS Simulator", "File Systems")
+
+# ============== DIRECTORY NAMESPACE ==============
+# files: ino -> file record, directories: ino -> {'name', 'parent', 'children', 'created'}.
+# Each directory hashes its entries by name (children: name -> ino), so resolving a
+# path costs one dict lookup per component. Inode 0 is the root directory.
+
+ROOT_INO = 0
+
+def new_ino():
+    st.session_state.next_ino += 1
+    return st.session_state.next_ino - 1
+
+def split_path(path):
+    return [part for part in path.split('/') if part]
+
+def resolve_path(path):
+    ino = ROOT_INO
+    for part in split_path(path):
+        d = st.session_state.directories.get(ino)
+        if d is None: return None
+        ino = d['children'].get(part)
+        if ino is None: return None
+    return ino
+
+def node_path(ino):
+    parts = []
+    while ino != ROOT_INO:
+        node = st.session_state.directories.get(ino) or st.session_state.files[ino]
+        parts.append(node['name'])
+        ino = node['parent']
+    return '/' + '/'.join(reversed(parts))
+
+def make_dir(path):
+    # mkdir -p: creates every missing component and returns the leaf's inode
+    ino = ROOT_INO
+    for part in split_path(path):
+        children = st.session_state.directories[ino]['children']
+        child = children.get(part)
+        if child is None:
+            child = new_ino()
+            st.session_state.directories[child] = {
+                'name': part, 'parent': ino, 'children': {}, 'created': datetime.now().strftime('%Y-%m-%d %H:%M')
+            }
+            children[part] = child
+        elif child not in st.session_state.directories:
+            return None, f"{part} is a file, not a directory"
+        ino = child
+    return ino, f"Directory {path} ready"
+
+def delete_node(ino):
+    # Recursive delete with an explicit stack so deep trees cannot hit the recursion limit
+    node = st.session_state.directories.get(ino) or st.session_state.files[ino]
+    del st.session_state.directories[node['parent']]['children'][node['name']]
+    stack = [ino]
+    while stack:
+        cur = stack.pop()
+        if cur in st.session_state.files:
+            st.session_state.block_owner[file_refs(st.session_state.files.pop(cur))] = FREE
+        else:
+            stack.extend(st.session_state.directories.pop(cur)['children'].values())
+
+def move_node(ino, dest_path, new_name=None):
+    dest = resolve_path(dest_path)
+    if dest is None or dest not in st.session_state.directories:
+        return False, f"{dest_path} is not a directory"
+    anc = dest
+    while anc is not None:
+        if anc == ino: return False, "Cannot move a directory into itself"
+        anc = st.session_state.directories[anc]['parent']
+    node = st.session_state.directories.get(ino) or st.session_state.files[ino]
+    name = new_name or node['name']
+    if not name or '/' in name:
+        return False, "Invalid name"
+    target = st.session_state.directories[dest]['children']
+    if name in target and target[name] != ino:
+        return False, f"{name} already exists in {dest_path}"
+    del st.session_state.directories[node['parent']]['children'][node['name']]
+    node['name'], node['parent'] = name, dest
+    target[name] = ino
+    return True, f"Moved to {node_path(ino)}"
 
 # ============== FILE ALLOCATION LOGIC ==============
 
-def get_used_blocks():
-    used = set()
-    for f in st.session_state.files.values():
-        if f.get('index_block') is not None: used.add(f['index_block'])
-        used.update(f['data_blocks'])
-    return used
+# block_owner[b] is the inode owning block b (data or index), or FREE. It is kept in
+# step with every allocate/delete so ownership lookups never scan file records.
+FREE = -1
+
+def file_refs(f):
+    return f['data_blocks'] + ([f['index_block']] if f['index_block'] is not None else [])
+
+def rebuild_block_owner():
+    owner = np.full(st.session_state.disk_blocks, FREE, dtype=np.int64)
+    for ino, f in st.session_state.files.items():
+        owner[file_refs(f)] = ino
+    st.session_state.block_owner = owner
 
 def allocate_file(name, size_kb, method, directory):
+    if not name or '/' in name:
+        return False, "Invalid file name"
+    dir_ino = resolve_path(directory)
+    if dir_ino in st.session_state.directories and name in st.session_state.directories[dir_ino]['children']:
+        return False, f"{name} already exists in {node_path(dir_ino)}"
+
     block_size = 4
     blocks_needed = (size_kb + block_size - 1) // block_size
-    used = get_used_blocks()
-    total_blocks = 64
+    owner = st.session_state.block_owner
+    free = owner == FREE
     
     # Simple check for space
-    if len(used) + blocks_needed + (1 if method == "Indexed" else 0) > total_blocks:
+    if blocks_needed + (1 if method == "Indexed" else 0) > free.sum():
         return False, "Not enough disk space"
 
-    available = [i for i in range(total_blocks) if i not in used]
+    available = np.flatnonzero(free)[:blocks_needed + 1].tolist()
+    record = {'name': name, 'parent': None, 'size': size_kb, 'blocks': blocks_needed, 'allocation': method,
+              'index_block': None, 'created': datetime.now().strftime('%Y-%m-%d %H:%M')}
     
     if method == "Indexed":
-        idx_block = available.pop(0)
-        data_blocks = available[:blocks_needed]
-        st.session_state.files[name] = {
-            'size': size_kb, 'blocks': blocks_needed, 'allocation': 'Indexed',
-            'index_block': idx_block, 'data_blocks': data_blocks, 'created': datetime.now().strftime('%Y-%m-%d %H:%M')
-        }
+        record['index_block'] = available.pop(0)
+        record['data_blocks'] = available[:blocks_needed]
     elif method == "Contiguous":
-        # Simplified contiguous: find first fit
-        start = -1
-        for i in range(total_blocks - blocks_needed + 1):
-            if all(j not in used for j in range(i, i + blocks_needed)):
-                start = i
-                break
-        if start == -1: return False, "No contiguous space found"
-        st.session_state.files[name] = {
-            'size': size_kb, 'blocks': blocks_needed, 'allocation': 'Contiguous',
-            'index_block': None, 'data_blocks': list(range(start, start + blocks_needed)), 
-            'created': datetime.now().strftime('%Y-%m-%d %H:%M')
-        }
+        # First fit: the first window whose free-block count equals its length
+        runs = np.concatenate(([0], np.cumsum(free)))
+        fits = np.flatnonzero(runs[blocks_needed:] - runs[:-blocks_needed] == blocks_needed)
+        if not len(fits): return False, "No contiguous space found"
+        start = int(fits[0])
+        record['data_blocks'] = list(range(start, start + blocks_needed))
     else: # Linked
-        data_blocks = available[:blocks_needed]
-        st.session_state.files[name] = {
-            'size': size_kb, 'blocks': blocks_needed, 'allocation': 'Linked',
-            'index_block': None, 'data_blocks': data_blocks, 'created': datetime.now().strftime('%Y-%m-%d %H:%M')
-        }
+        record['data_blocks'] = available[:blocks_needed]
+
+    # Missing directories are only created once the blocks are known to fit
+    dir_ino, msg = make_dir(directory)
+    if dir_ino is None:
+        return False, msg
+    record['parent'] = dir_ino
     
-    st.session_state.directories[directory].append(name)
+    ino = new_ino()
+    st.session_state.files[ino] = record
+    st.session_state.directories[dir_ino]['children'][name] = ino
+    owner[file_refs(record)] = ino
     return True, "File created successfully"
 
+def fragmentation_stats():
+    # Extents are maximal runs of physically adjacent blocks with the same owner
+    owner = st.session_state.block_owner
+    starts = np.flatnonzero(np.diff(owner, prepend=owner[:1] - 1))
+    run_owner = owner[starts]
+    run_len = np.diff(np.append(starts, len(owner)))
+    files = st.session_state.files
+    inos, extents = np.unique(run_owner[run_owner != FREE], return_counts=True)
+    _, blocks = np.unique(owner[owner != FREE], return_counts=True)
+    rows = [{
+        'Path': node_path(int(i)), 'Method': files[int(i)]['allocation'], 'Blocks': int(n), 'Extents': int(e),
+        'Fragmentation': (e - 1) / (n - 1) if n > 1 else 0.0,
+    } for i, e, n in zip(inos, extents, blocks)]
+    free_runs = run_len[run_owner == FREE]
+    summary = {
+        'free_blocks': int(free_runs.sum()), 'free_extents': len(free_runs),
+        'largest_free': int(free_runs.max()) if len(free_runs) else 0,
+    }
+    return rows, summary
+
+# ============== BUFFER CACHE POLICIES ==============
+# Every policy exposes access(block) -> (hit, evicted_block_or_None) and `in`.
+
+class LRUCache:
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.entries = OrderedDict()
+
+    def __contains__(self, block):
+        return block in self.entries
+
+    def access(self, block):
+        if block in self.entries:
+            self.entries.move_to_end(block)
+            return True, None
+        evicted = None
+        if len(self.entries) >= self.capacity:
+            evicted, _ = self.entries.popitem(last=False)
+        self.entries[block] = None
+        return False, evicted
+
+class ClockCache:
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.slots = []          # block held by each frame
+        self.ref = bytearray(capacity)
+        self.where = {}          # block -> frame index
+        self.hand = 0
+
+    def __contains__(self, block):
+        return block in self.where
+
+    def access(self, block):
+        slot = self.where.get(block)
+        if slot is not None:
+            self.ref[slot] = 1
+            return True, None
+        if len(self.slots) < self.capacity:
+            self.where[block] = len(self.slots)
+            self.slots.append(block)
+            self.ref[len(self.slots) - 1] = 1
+            return False, None
+        while self.ref[self.hand]:
+            self.ref[self.hand] = 0
+            self.hand = (self.hand + 1) % self.capacity
+        evicted = self.slots[self.hand]
+        del self.where[evicted]
+        self.slots[self.hand] = block
+        self.where[block] = self.hand
+        self.ref[self.hand] = 1
+        self.hand = (self.hand + 1) % self.capacity
+        return False, evicted
+
+class TwoQCache:
+    # Full 2Q (Johnson & Shasha): A1in FIFO for first touches, A1out ghost list, Am LRU for re-references.
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.k_in = max(1, capacity // 4)
+        self.k_out = max(1, capacity // 2)
+        self.a1in, self.a1out, self.am = OrderedDict(), OrderedDict(), OrderedDict()
+
+    def __contains__(self, block):
+        return block in self.am or block in self.a1in
+
+    def _reclaim(self):
+        if len(self.a1in) + len(self.am) < self.capacity:
+            return None
+        if len(self.a1in) > self.k_in or not self.am:
+            evicted, _ = self.a1in.popitem(last=False)
+            self.a1out[evicted] = None
+            if len(self.a1out) > self.k_out:
+                self.a1out.popitem(last=False)
+            return evicted
+        evicted, _ = self.am.popitem(last=False)
+        return evicted
+
+    def access(self, block):
+        if block in self.am:
+            self.am.move_to_end(block)
+            return True, None
+        if block in self.a1in:
+            return True, None
+        evicted = self._reclaim()
+        if block in self.a1out:
+            del self.a1out[block]
+            self.am[block] = None
+        else:
+            self.a1in[block] = None
+        return False, evicted
+
+class ARCCache:
+    # Adaptive Replacement Cache (Megiddo & Modha): T1/T2 resident, B1/B2 ghosts, p = target size of T1.
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.p = 0.0
+        self.t1, self.t2, self.b1, self.b2 = OrderedDict(), OrderedDict(), OrderedDict(), OrderedDict()
+
+    def __contains__(self, block):
+        return block in self.t1 or block in self.t2
+
+    def _replace(self, block):
+        if len(self.t1) + len(self.t2) < self.capacity:
+            return None
+        if self.t1 and (len(self.t1) > self.p or (block in self.b2 and len(self.t1) == self.p)):
+            evicted, _ = self.t1.popitem(last=False)
+            self.b1[evicted] = None
+        else:
+            evicted, _ = self.t2.popitem(last=False)
+            self.b2[evicted] = None
+        return evicted
+
+    def access(self, block):
+        c = self.capacity
+        if block in self.t1:
+            del self.t1[block]
+            self.t2[block] = None
+            return True, None
+        if block in self.t2:
+            self.t2.move_to_end(block)
+            return True, None
+        if block in self.b1:
+            self.p = min(c, self.p + max(len(self.b2) / len(self.b1), 1))
+            evicted = self._replace(block)
+            del self.b1[block]
+            self.t2[block] = None
+            return False, evicted
+        if block in self.b2:
+            self.p = max(0, self.p - max(len(self.b1) / len(self.b2), 1))
+            evicted = self._replace(block)
+            del self.b2[block]
+            self.t2[block] = None
+            return False, evicted
+        evicted = None
+        l1 = len(self.t1) + len(self.b1)
+        if l1 == c:
+            if len(self.t1) < c:
+                self.b1.popitem(last=False)
+                evicted = self._replace(block)
+            else:
+                evicted, _ = self.t1.popitem(last=False)
+        elif l1 + len(self.t2) + len(self.b2) >= c:
+            if l1 + len(self.t2) + len(self.b2) == 2 * c:
+                self.b2.popitem(last=False)
+            evicted = self._replace(block)
+        self.t1[block] = None
+        return False, evicted
+
+CACHE_POLICIES = {"LRU": LRUCache, "CLOCK": ClockCache, "2Q": TwoQCache, "ARC": ARCCache}
+
+# ============== BUFFER CACHE SIMULATOR ==============
+
+def generate_workload(files, pattern, n_accesses, read_ratio, seed=42):
+    rng = random.Random(seed)
+    chains = [f['data_blocks'] for f in files.values() if f['data_blocks']]
+    if not chains:
+        return [], bytearray()
+    all_blocks = [b for chain in chains for b in chain]
+
+    if pattern == "Sequential":
+        reps = n_accesses // len(all_blocks) + 1
+        blocks = (all_blocks * reps)[:n_accesses]
+    elif pattern == "Uniform":
+        blocks = rng.choices(all_blocks, k=n_accesses)
+    else: # Zipf: the i-th hottest block is referenced with weight 1/i
+        hot = all_blocks[:]
+        rng.shuffle(hot)
+        cum, total = [], 0.0
+        for i in range(1, len(hot) + 1):
+            total += 1.0 / i
+            cum.append(total)
+        blocks = rng.choices(hot, cum_weights=cum, k=n_accesses)
+
+    writes = bytearray(rng.random() >= read_ratio for _ in range(n_accesses))
+    return blocks, writes
+
+def simulate_cache(blocks, writes, files, policy, cache_size, write_back=True, read_ahead=0, flush_interval=0, job=None):
+    cache = CACHE_POLICIES[policy](max(1, cache_size))
+    next_block = {}
+    for f in files.values():
+        chain = f['data_blocks']
+        for a, b in zip(chain, chain[1:]):
+            next_block[a] = b
+
+    access = cache.access
+    dirty = set()
+    hits = disk_reads = disk_writes = prefetched = 0
+    bursts = []
+
+    for i, block in enumerate(blocks):
+        if job is not None and not i & 4095:
+            job.checkpoint(i / len(blocks))
+        is_write = writes[i]
+        hit, evicted = access(block)
+        if evicted is not None and evicted in dirty:
+            dirty.discard(evicted)
+            disk_writes += 1
+        if hit:
+            hits += 1
+        elif not is_write:
+            disk_reads += 1
+            nxt = next_block.get(block)
+            for _ in range(read_ahead):
+                if nxt is None: break
+                if nxt not in cache:
+                    _, evicted = access(nxt)
+                    if evicted is not None and evicted in dirty:
+                        dirty.discard(evicted)
+                        disk_writes += 1
+                    disk_reads += 1
+                    prefetched += 1
+                nxt = next_block.get(nxt)
+
+        if is_write:
+            if write_back: dirty.add(block)
+            else: disk_writes += 1
+
+        if flush_interval and (i + 1) % flush_interval == 0 and dirty:
+            bursts.append(len(dirty))
+            disk_writes += len(dirty)
+            dirty.clear()
+
+    # Final sync so both write policies are charged for every dirty block
+    if dirty:
+        bursts.append(len(dirty))
+        disk_writes += len(dirty)
+
+    n = len(blocks)
+    baseline_ios = n
+    return {
+        'policy': policy, 'cache_size': cache_size, 'accesses': n,
+        'hits': hits, 'misses': n - hits, 'hit_ratio': hits / n if n else 0,
+        'disk_reads': disk_reads, 'disk_writes': disk_writes, 'prefetched': prefetched,
+        'ios_saved': baseline_ios - disk_reads - disk_writes,
+        'flush_bursts': len(bursts), 'max_burst': max(bursts, default=0),
+        'avg_burst': sum(bursts) / len(bursts) if bursts else 0,
+    }
+
+def replay_workload(files, pattern, n_accesses, read_ratio, opts, policy=None, cache_size=None, job=None):
+    # One policy and size, or with policy=None every policy at 10%..100% of the blocks touched
+    blocks, writes = generate_workload(files, pattern, n_accesses, read_ratio)
+    if policy is not None:
+        runs = [(policy, cache_size)]
+    else:
+        n_blocks = len(set(blocks))
+        sizes = sorted({max(1, n_blocks * k // 10) for k in range(1, 11)})
+        runs = [(p, size) for p in CACHE_POLICIES for size in sizes]
+    results = []
+    for k, (p, size) in enumerate(runs):
+        if job is not None: job.stage(k, len(runs))
+        results.append(simulate_cache(blocks, writes, files, p, size, job=job, **opts))
+    return results
+
+# ============== DISK IMAGE BACKEND ==============
+# Layout: [superblock][free-space bitmap][inode table][data blocks], all 4 KB blocks.
+# Simulated block i lives at image block data_start + i. Linked files keep the next
+# pointer in the first 4 bytes of each data block; indexed files keep a u32 array in
+# their index block. The image is created sparse and accessed through mmap, so only
+# pages that are actually read are faulted in.
+
+IMG_MAGIC = b'OSSIMFS1'
+IMG_VERSION = 1
+IMG_BLOCK = 4096
+SUPERBLOCK_FMT = struct.Struct('<8s10I')   # magic, version, block size, total, inodes, bitmap/inode/data geometry, free
+INODE_FMT = struct.Struct('<BBBxiIIii88s16s')  # used, kind, method, parent, size, blocks, index, first, name, created
+INODE_SIZE = 128
+KIND_FILE, KIND_DIR = 1, 2
+METHODS = ['Contiguous', 'Linked', 'Indexed']
+NO_BLOCK = -1
+IMG_MAX_BLOCKS = 1 << 24        # 64 GiB sparse; fsck holds a couple of bytes per block
+SESSION_MAX_BLOCKS = 1 << 20    # loaded images keep an int64 owner per block in the session
+# Images are plain file names inside this directory, never arbitrary server paths
+IMAGE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'disk_images')
+
+def image_path(name):
+    if not name or '..' in name or any(c in name for c in '/\\\0'):
+        return None
+    return os.path.join(IMAGE_DIR, name)
+
+def image_error(e):
+    # OSError text includes the server-side path; only the reason is shown
+    return e.strerror if isinstance(e, OSError) and e.strerror else str(e)
+
+def _geometry(total_blocks, inode_count):
+    bitmap_blocks = (total_blocks + IMG_BLOCK * 8 - 1) // (IMG_BLOCK * 8)
+    inode_blocks = (inode_count * INODE_SIZE + IMG_BLOCK - 1) // IMG_BLOCK
+    bitmap_start = 1
+    inode_start = bitmap_start + bitmap_blocks
+    data_start = inode_start + inode_blocks
+    return bitmap_start, bitmap_blocks, inode_start, inode_blocks, data_start
+
+class DiskImage:
+    def __init__(self, path, writable=False):
+        self.path = path
+        self.fh = open(path, 'r+b' if writable else 'rb')
+        if os.fstat(self.fh.fileno()).st_size < SUPERBLOCK_FMT.size:
+            self.fh.close()
+            raise ValueError(f"{os.path.basename(path)} is too small to be a disk image")
+        self.mm = mmap.mmap(self.fh.fileno(), 0, access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ)
+        (magic, self.version, self.block_size, self.total_blocks, self.inode_count,
+         self.bitmap_start, self.bitmap_blocks, self.inode_start, self.inode_blocks,
+         self.data_start, self.free_blocks) = SUPERBLOCK_FMT.unpack_from(self.mm, 0)
+        if magic != IMG_MAGIC:
+            self.close()
+            raise ValueError(f"{os.path.basename(path)} is not an OS Simulator disk image")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if not self.mm.closed: self.mm.close()
+        self.fh.close()
+
+    def write_superblock(self):
+        SUPERBLOCK_FMT.pack_into(
+            self.mm, 0, IMG_MAGIC, self.version, self.block_size, self.total_blocks, self.inode_count,
+            self.bitmap_start, self.bitmap_blocks, self.inode_start, self.inode_blocks, self.data_start, self.free_blocks
+        )
+
+    # ---- bitmap ----
+    def is_used(self, block):
+        return self.mm[self.bitmap_start * IMG_BLOCK + (block >> 3)] >> (block & 7) & 1
+
+    def set_used(self, block, used=True):
+        off = self.bitmap_start * IMG_BLOCK + (block >> 3)
+        if used: self.mm[off] |= 1 << (block & 7)
+        else: self.mm[off] &= ~(1 << (block & 7)) & 0xFF
+
+    def used_count(self):
+        start = self.bitmap_start * IMG_BLOCK
+        return int.from_bytes(self.mm[start:start + (self.total_blocks + 7) // 8], 'little').bit_count()
+
+    def read_bitmap(self):
+        # Whole bitmap as a bool array; slicing copies, so no buffer stays exported from the mmap
+        start = self.bitmap_start * IMG_BLOCK
+        raw = np.frombuffer(self.mm[start:start + (self.total_blocks + 7) // 8], dtype=np.uint8)
+        return np.unpackbits(raw, bitorder='little')[:self.total_blocks].astype(bool)
+
+    def write_bitmap(self, used):
+        start = self.bitmap_start * IMG_BLOCK
+        packed = np.packbits(used, bitorder='little').tobytes()
+        self.mm[start:start + len(packed)] = packed
+
+    # ---- inodes ----
+    def read_inode(self, ino):
+        used, kind, method, parent, size, blocks, index, first, name, created = INODE_FMT.unpack_from(
+            self.mm, self.inode_start * IMG_BLOCK + ino * INODE_SIZE
+        )
+        if not used: return None
+        if kind not in (KIND_FILE, KIND_DIR) or (kind == KIND_FILE and method >= len(METHODS)):
+            raise ValueError(f"inode {ino} has unknown kind {kind} / method {method}")
+        return {
+            'ino': ino, 'kind': kind, 'allocation': METHODS[method] if kind == KIND_FILE else None,
+            'parent': parent, 'size': size, 'blocks': blocks,
+            'index_block': None if index == NO_BLOCK else index, 'first_block': first,
+            'name': name.rstrip(b'\0').decode('utf-8', 'replace'),
+            'created': created.rstrip(b'\0').decode('ascii', 'replace'),
+        }
+
+    def write_inode(self, ino, kind, name, parent, size=0, blocks=0, method='Contiguous',
+                    index_block=None, first_block=NO_BLOCK, created=''):
+        INODE_FMT.pack_into(
+            self.mm, self.inode_start * IMG_BLOCK + ino * INODE_SIZE,
+            1, kind, METHODS.index(method), parent, size, blocks,
+            NO_BLOCK if index_block is None else index_block, first_block,
+            name.encode('utf-8')[:88], created.encode('ascii')[:16]
+        )
+
+    def used_slots(self, start=0, stop=None):
+        # Reads only the 'used' byte of each slot, a chunk at a time, so empty slots cost no Python work
+        stop = min(self.inode_count, stop or self.inode_count)
+        base = self.inode_start * IMG_BLOCK
+        for lo in range(start, stop, 65_536):
+            hi = min(stop, lo + 65_536)
+            used = np.frombuffer(self.mm[base + lo * INODE_SIZE:base + hi * INODE_SIZE], dtype=np.uint8)[::INODE_SIZE]
+            for i in np.flatnonzero(used):
+                yield lo + int(i)
+
+    def inodes(self, start=0, stop=None):
+        for ino in self.used_slots(start, stop):
+            yield self.read_inode(ino)
+
+    # ---- data blocks ----
+    def _block_off(self, block):
+        return (self.data_start + block) * IMG_BLOCK
+
+    def read_pointer(self, block, slot=0):
+        return struct.unpack_from('<i', self.mm, self._block_off(block) + 4 * slot)[0]
+
+    def write_pointer(self, block, value, slot=0):
+        struct.pack_into('<i', self.mm, self._block_off(block) + 4 * slot, value)
+
+    def file_blocks(self, node, limit=None):
+        # Returns (data_blocks, error_or_None) following the file's allocation method.
+        n = node['blocks'] if limit is None else min(node['blocks'], limit)
+        method = node['allocation']
+        if method == 'Contiguous':
+            return list(range(node['first_block'], node['first_block'] + n)), None
+        if method == 'Indexed':
+            ib = node['index_block']
+            if ib is None or not 0 <= ib < self.total_blocks:
+                return [], f"index block {ib} out of range"
+            if n > IMG_BLOCK // 4:
+                return [], f"{n} blocks exceed one index block"
+            return list(struct.unpack_from(f'<{n}i', self.mm, self._block_off(ib))), None
+        chain, seen, b = [], set(), node['first_block']
+        while b != NO_BLOCK and len(chain) < n:
+            if not 0 <= b < self.total_blocks: return chain, f"chain points outside disk ({b})"
+            if b in seen: return chain, f"chain loops at block {b}"
+            seen.add(b)
+            chain.append(b)
+            b = self.read_pointer(b)
+        if len(chain) < n: return chain, f"chain ends after {len(chain)} of {n} blocks"
+        return chain, None
+
+def format_image(path, total_blocks, inode_count=None):
+    inode_count = inode_count or max(64, total_blocks // 4)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    bitmap_start, bitmap_blocks, inode_start, inode_blocks, data_start = _geometry(total_blocks, inode_count)
+    with open(path, 'wb') as fh:
+        fh.truncate((data_start + total_blocks) * IMG_BLOCK)   # sparse on every mainstream file system
+        fh.seek(0)
+        fh.write(SUPERBLOCK_FMT.pack(
+            IMG_MAGIC, IMG_VERSION, IMG_BLOCK, total_blocks, inode_count,
+            bitmap_start, bitmap_blocks, inode_start, inode_blocks, data_start, total_blocks
+        ))
+    with DiskImage(path, writable=True) as img:
+        img.write_inode(0, KIND_DIR, '/', NO_BLOCK)
+
+def save_image(path, files, directories, total_blocks):
+    for f in files.values():
+        if f['allocation'] == 'Indexed' and len(f['data_blocks']) > IMG_BLOCK // 4:
+            return False, f"{f['name']}: indexed files are limited to {IMG_BLOCK // 4} blocks"
+    # Build the image next to the target and swap it in, so a failed save keeps the old image
+    n_inodes = max(64, len(directories) + len(files))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(suffix='.tmp', dir=os.path.dirname(path))
+    os.close(fd)
+    try:
+        _write_image(tmp, files, directories, total_blocks, n_inodes)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp): os.remove(tmp)
+    return True, f"Saved {len(files)} files to {os.path.basename(path)}"
+
+def _write_image(path, files, directories, total_blocks, n_inodes):
+    format_image(path, total_blocks, n_inodes)
+    with DiskImage(path, writable=True) as img:
+        # Session inode numbers may have gaps after deletes; renumber breadth-first from the root
+        ino_map = {ROOT_INO: 0}
+        queue = [ROOT_INO]
+        for dir_ino in queue:
+            for name, child in directories[dir_ino]['children'].items():
+                ino = ino_map[child] = len(ino_map)
+                if child in directories:
+                    img.write_inode(ino, KIND_DIR, name, ino_map[dir_ino], created=directories[child]['created'])
+                    queue.append(child)
+                    continue
+                f = files[child]
+                data = f['data_blocks']
+                if f['allocation'] == 'Indexed':
+                    struct.pack_into(f'<{len(data)}i', img.mm, img._block_off(f['index_block']), *data)
+                    img.set_used(f['index_block'])
+                elif f['allocation'] == 'Linked':
+                    for a, b in zip(data, data[1:] + [NO_BLOCK]):
+                        img.write_pointer(a, b)
+                for b in data:
+                    img.set_used(b)
+                img.write_inode(
+                    ino, KIND_FILE, name, ino_map[dir_ino], f['size'], f['blocks'], f['allocation'],
+                    f['index_block'], data[0] if data else NO_BLOCK, f['created']
+                )
+        img.free_blocks = total_blocks - img.used_count()
+        img.write_superblock()
+
+def geometry_error(img):
+    if img.version != IMG_VERSION or img.block_size != IMG_BLOCK:
+        return f"unsupported version {img.version} / block size {img.block_size}"
+    expected = _geometry(img.total_blocks, img.inode_count)
+    if expected != (img.bitmap_start, img.bitmap_blocks, img.inode_start, img.inode_blocks, img.data_start):
+        return "region offsets do not match total blocks / inode count"
+    if len(img.mm) < (img.data_start + img.total_blocks) * IMG_BLOCK:
+        return "image is shorter than the geometry it declares"
+    return None
+
+def _parent_cycles(parents):
+    # parents: dir ino -> parent ino, root excluded. Returns the directories whose parent
+    # chain loops back on itself; everything below them is unreachable from the root.
+    cyclic, done = set(), set()
+    for start in parents:
+        path, pos, ino = [], {}, start
+        while ino in parents and ino not in done:
+            if ino in pos:
+                cyclic.update(path[pos[ino]:])
+                break
+            pos[ino] = len(path)
+            path.append(ino)
+            ino = parents[ino]
+        done.update(path)
+    return cyclic
+
+def load_image(img):
+    error = geometry_error(img)
+    if error:
+        raise ValueError(f"{error}; run fsck for details")
+    if img.total_blocks > SESSION_MAX_BLOCKS:
+        raise ValueError(f"{img.total_blocks:,} blocks is more than a session can hold ({SESSION_MAX_BLOCKS:,})")
+    files = {}
+    directories = {ROOT_INO: {'name': '/', 'parent': None, 'children': {}, 'created': ''}}
+    # Block ownership is built and checked here, so an image with a broken block map is
+    # rejected before anything reaches the session
+    owner = np.full(img.total_blocks, FREE, dtype=np.int64)
+    for node in img.inodes(1):
+        if node['kind'] == KIND_DIR:
+            directories[node['ino']] = {'name': node['name'], 'parent': node['parent'], 'children': {}, 'created': node['created']}
+            continue
+        label = f"inode {node['ino']} ({node['name']})"
+        data, err = img.file_blocks(node)
+        if err:
+            raise ValueError(f"{label}: {err}; run fsck for details")
+        record = files[node['ino']] = {
+            'name': node['name'], 'parent': node['parent'], 'size': node['size'], 'blocks': node['blocks'],
+            'allocation': node['allocation'], 'index_block': node['index_block'], 'data_blocks': data,
+            'created': node['created']
+        }
+        refs = np.asarray(file_refs(record), dtype=np.int64)
+        if len(refs) and (refs.min() < 0 or refs.max() >= img.total_blocks):
+            raise ValueError(f"{label} references blocks outside the disk; run fsck for details")
+        if len(np.unique(refs)) != len(refs) or (owner[refs] != FREE).any():
+            raise ValueError(f"{label} shares blocks with another file; run fsck for details")
+        owner[refs] = node['ino']
+    # Orphans (missing parent, or a directory on a parent cycle) are re-homed under
+    # /lost+found once everything else is linked; clashing names get their inode appended
+    def link(ino, node):
+        siblings = directories[node['parent']]['children']
+        if node['name'] in siblings:
+            node['name'] = f"{node['name']}#{ino}"
+        siblings[node['name']] = ino
+
+    cyclic = _parent_cycles({ino: d['parent'] for ino, d in directories.items() if ino != ROOT_INO})
+    orphans = []
+    for ino, node in list(directories.items()) + list(files.items()):
+        if ino == ROOT_INO: continue
+        if node['parent'] not in directories or ino in cyclic:
+            orphans.append((ino, node))
+        else:
+            link(ino, node)
+    if orphans:
+        lost = directories[ROOT_INO]['children'].get('lost+found')
+        if lost not in directories:
+            lost = img.inode_count
+            directories[lost] = {'name': 'lost+found', 'parent': ROOT_INO, 'children': {}, 'created': ''}
+            link(lost, directories[lost])
+        for ino, node in orphans:
+            node['parent'] = lost
+            link(ino, node)
+    return files, directories, max(list(directories) + list(files)) + 1, owner
+
+def fsck_image(img, repair=False):
+    issues = []
+    def report(check, detail, severity='error'):
+        issues.append({'Severity': severity, 'Check': check, 'Detail': detail})
+
+    error = geometry_error(img)
+    if error:
+        report('Superblock', error)
+        return issues
+
+    owners = bytearray(img.total_blocks)   # reference count per block, saturating at 255
+    dirs = {0}
+    names = set()
+    nodes = []
+    for ino in img.used_slots():
+        try:
+            nodes.append(img.read_inode(ino))
+        except ValueError as e:
+            report('Inode', str(e))
+    for node in nodes:
+        if node['kind'] == KIND_DIR: dirs.add(node['ino'])
+    cyclic = _parent_cycles({n['ino']: n['parent'] for n in nodes if n['kind'] == KIND_DIR and n['ino'] != 0})
+    for node in nodes:
+        label = f"inode {node['ino']} ({node['name']})"
+        if node['ino'] != 0 and node['parent'] not in dirs:
+            report('Directory', f"{label} has missing parent inode {node['parent']}")
+        if node['ino'] in cyclic:
+            report('Directory', f"{label} is on a parent cycle, unreachable from /")
+        if node['kind'] != KIND_FILE: continue
+        if (node['parent'], node['name']) in names:
+            report('Directory', f"{label} duplicates a name in its directory")
+        names.add((node['parent'], node['name']))
+
+        data, err = img.file_blocks(node)
+        if err: report('Block map', f"{label}: {err}")
+        refs = data + ([node['index_block']] if node['index_block'] is not None else [])
+        for b in refs:
+            if not 0 <= b < img.total_blocks:
+                report('Block map', f"{label} references block {b} outside the disk")
+                continue
+            if owners[b]: report('Cross-link', f"block {b} is claimed again by {label}")
+            owners[b] = min(255, owners[b] + 1)
+        if (node['size'] + 3) // 4 != node['blocks']:
+            report('Inode', f"{label} size {node['size']} KB does not match {node['blocks']} blocks", 'warning')
+
+    used = img.read_bitmap()
+    referenced = np.frombuffer(owners, dtype=np.uint8) > 0
+    leaked = int(np.count_nonzero(used & ~referenced))
+    missing = int(np.count_nonzero(referenced & ~used))
+    if repair and (leaked or missing):
+        img.write_bitmap(referenced)
+    if leaked: report('Bitmap', f"{leaked} blocks marked used but unreferenced", 'warning')
+    if missing: report('Bitmap', f"{missing} referenced blocks marked free")
+
+    free = img.total_blocks - img.used_count()
+    if free != img.free_blocks:
+        report('Superblock', f"free count {img.free_blocks} does not match bitmap ({free})", 'warning')
+        if repair:
+            img.free_blocks = free
+            img.write_superblock()
+    return issues
+
+MAP_CELLS = 1 << 16   # disk map heatmap size; bigger disks are shown downsampled
+
 # ============== SESSION STATE ==============
 if 'files' not in st.session_state:
     st.session_state.files = {
-        'readme.txt': {'size': 8, 'blocks': 2, 'allocation': 'Indexed', 'index_block': 5, 'data_blocks': [10, 11], 'created': '2026-01-26 10:00'}
+        4: {'name': 'readme.txt', 'parent': 1, 'size': 8, 'blocks': 2, 'allocation': 'Indexed', 'index_block': 5, 'data_blocks': [10, 11], 'created': '2026-01-26 10:00'}
     }
 if 'directories' not in st.session_state:
-    st.session_state.directories = {'Documents': ['readme.txt'], 'System': [], 'Pictures': []}
-if 'selected_file' not in st.session_state: st.session_state.selected_file = 'readme.txt'
+    st.session_state.directories = {
+        ROOT_INO: {'name': '/', 'parent': None, 'children': {'Documents': 1, 'System': 2, 'Pictures': 3}, 'created': '2026-01-26 10:00'},
+        1: {'name': 'Documents', 'parent': ROOT_INO, 'children': {'readme.txt': 4}, 'created': '2026-01-26 10:00'},
+        2: {'name': 'System', 'parent': ROOT_INO, 'children': {}, 'created': '2026-01-26 10:00'},
+        3: {'name': 'Pictures', 'parent': ROOT_INO, 'children': {}, 'created': '2026-01-26 10:00'},
+    }
+if 'next_ino' not in st.session_state: st.session_state.next_ino = 5
+if 'selected_file' not in st.session_state: st.session_state.selected_file = 4
+if 'expanded_dirs' not in st.session_state: st.session_state.expanded_dirs = {ROOT_INO, 1}
+if 'tree_limits' not in st.session_state: st.session_state.tree_limits = {}
+if 'disk_blocks' not in st.session_state: st.session_state.disk_blocks = 64
+if 'block_owner' not in st.session_state: rebuild_block_owner()
+if 'cache_job' not in st.session_state: st.session_state.cache_job = None
 
-# ============== SIDEBAR ==============
-with st.sidebar:
-    st.title("OS Simulator")
-    if st.button("🏠 Back to Home", use_container_width=True):
-        st.switch_page("main.py")
-    st.divider()
-    st.caption("Module: File Systems")
+done_job = finished_job('cache_job')
+if done_job:
+    if done_job.label == "Cache replay":
+        st.session_state.cache_results = done_job.result[0]
+    else:
+        st.session_state.cache_sweep = done_job.result
 
 # ============== MAIN UI ==============
 st.title("📁 File Management & Disk Allocation")
@@ -114,6 +833,10 @@ st.title("📁 File Management & Disk Allocation")
 with st.container(border=True):
     st.subheader("🛠️ File System Control Center")
     c1, c2, c3 = st.columns([1.5, 2, 1], gap="medium")
+    sel = st.session_state.selected_file
+    if sel in st.session_state.directories: current_dir = node_path(sel)
+    elif sel in st.session_state.files: current_dir = node_path(st.session_state.files[sel]['parent'])
+    else: current_dir = "/"
     
     with c1:
         method = st.selectbox("Allocation Strategy", ["Indexed", "Contiguous", "Linked"])
@@ -122,17 +845,28 @@ with st.container(border=True):
         with st.popover("➕ Create New File", use_container_width=True):
             f_name = st.text_input("Filename", value="new_file.txt")
             f_size = st.number_input("Size (KB)", min_value=1, value=12)
-            f_dir = st.selectbox("Target Directory", list(st.session_state.directories.keys()))
+            f_dir = st.text_input("Target Directory", value=current_dir, help="Missing directories are created")
             if st.button("Commit to Disk", type="primary"):
-                success, msg = allocate_file(f_name, f_size, method, f_dir)
+                with prof.phase("allocation"):
+                    success, msg = allocate_file(f_name, f_size, method, f_dir)
                 if success: st.toast(msg)
                 else: st.error(msg)
                 st.rerun()
+        with st.popover("📁 New Folder", use_container_width=True):
+            d_path = st.text_input("Folder Path", value=current_dir.rstrip('/') + "/new_folder")
+            if st.button("Create Folder", type="primary"):
+                ino, msg = make_dir(d_path)
+                if ino is None: st.error(msg)
+                else:
+                    st.toast(msg)
+                    st.rerun()
                 
     with c3:
         if st.button("🗑️ Wipe Disk", type="primary", use_container_width=True):
             st.session_state.files = {}
-            st.session_state.directories = {k: [] for k in st.session_state.directories}
+            st.session_state.block_owner[:] = FREE
+            for d in st.session_state.directories.values():
+                d['children'] = {n: i for n, i in d['children'].items() if i in st.session_state.directories}
             st.rerun()
 
 st.divider()
@@ -140,67 +874,144 @@ st.divider()
 # VISUALIZATION
 col_tree, col_attr, col_disk = st.columns([1, 1, 2], gap="large")
 
-with col_tree:
+with col_tree, prof.phase("directory tree"):
     st.subheader("Directory Tree")
-    for dir_name, files in st.session_state.directories.items():
-        with st.expander(f"📂 {dir_name}", expanded=True):
-            if not files: st.caption("Empty")
-            for f in files:
-                if st.button(f"📄 {f}", key=f"btn_{f}", use_container_width=True):
-                    st.session_state.selected_file = f
+    def go_to_path():
+        target = resolve_path(st.session_state.go_path)
+        if target is None:
+            st.toast(f"No such path: {st.session_state.go_path}")
+            return
+        st.session_state.selected_file = target
+        anc = (st.session_state.directories.get(target) or st.session_state.files[target])['parent']
+        while anc is not None:
+            st.session_state.expanded_dirs.add(anc)
+            anc = st.session_state.directories[anc]['parent']
+
+    st.text_input("Go to Path", key="go_path", on_change=go_to_path, placeholder="/Documents/readme.txt")
+
+    # Only expanded directories are walked, and each lists at most `limit` children,
+    # so rendering cost follows what is open rather than the size of the tree.
+    def open_dir(ino, depth):
+        limit = st.session_state.tree_limits.get(ino, 50)
+        return ino, depth, iter(list(islice(st.session_state.directories[ino]['children'].items(), limit)))
+
+    stack = [open_dir(ROOT_INO, 0)]
+    while stack:
+        ino, depth, entries = stack[-1]
+        indent = "\u2003" * depth
+        entry = next(entries, None)
+        if entry is None:
+            stack.pop()
+            n_children = len(st.session_state.directories[ino]['children'])
+            limit = st.session_state.tree_limits.get(ino, 50)
+            if n_children == 0 and ino != ROOT_INO:
+                st.caption(f"{indent}Empty")
+            elif n_children > limit:
+                if st.button(f"{indent}… show more ({n_children - limit:,} hidden)", key=f"more_{ino}", use_container_width=True):
+                    st.session_state.tree_limits[ino] = limit * 4
                     st.rerun()
+            continue
+        name, child = entry
+        if child in st.session_state.directories:
+            is_open = child in st.session_state.expanded_dirs
+            if st.button(f"{indent}{'📂' if is_open else '📁'} {name}", key=f"dir_{child}", use_container_width=True):
+                st.session_state.expanded_dirs ^= {child}
+                st.session_state.selected_file = child
+                st.rerun()
+            if is_open:
+                stack.append(open_dir(child, depth + 1))
+        elif st.button(f"{indent}📄 {name}", key=f"file_{child}", use_container_width=True):
+            st.session_state.selected_file = child
+            st.rerun()
 
-with col_attr:
+with col_attr, prof.phase("attributes"):
     st.subheader("File Attributes")
-    if st.session_state.selected_file in st.session_state.files:
-        f = st.session_state.files[st.session_state.selected_file]
+    sel = st.session_state.selected_file
+    if sel in st.session_state.files or (sel in st.session_state.directories and sel != ROOT_INO):
+        is_dir = sel in st.session_state.directories
+        f = st.session_state.directories[sel] if is_dir else st.session_state.files[sel]
         with st.container(border=True):
-            st.markdown(f"**Name:** {st.session_state.selected_file}")
-            st.markdown(f"**Method:** {f['allocation']}")
-            st.markdown(f"**Size:** {f['size']} KB")
-            st.markdown(f"**Blocks:** {f['blocks']}")
+            st.markdown(f"**Path:** `{node_path(sel)}`")
+            st.markdown(f"**Inode:** {sel}")
+            if is_dir:
+                st.markdown(f"**Entries:** {len(f['children']):,}")
+            else:
+                st.markdown(f"**Method:** {f['allocation']}")
+                st.markdown(f"**Size:** {f['size']} KB")
+                st.markdown(f"**Blocks:** {f['blocks']}")
             st.markdown(f"**Created:** {f['created']}")
-            if f['index_block'] is not None:
-                st.error(f"Index Block: {f['index_block']}")
-            st.info(f"Data Blocks: {', '.join(map(str, f['data_blocks']))}")
-            
-            if st.button("Delete File", use_container_width=True):
-                # Deletion logic
-                name = st.session_state.selected_file
-                del st.session_state.files[name]
-                for d in st.session_state.directories:
-                    if name in st.session_state.directories[d]: st.session_state.directories[d].remove(name)
+            if not is_dir:
+                if f['index_block'] is not None:
+                    st.error(f"Index Block: {f['index_block']}")
+                st.info(f"Data Blocks: {', '.join(map(str, f['data_blocks']))}")
+
+            with st.popover("✏️ Move / Rename", use_container_width=True):
+                mv_dest = st.text_input("Destination Directory", value=node_path(f['parent']))
+                mv_name = st.text_input("New Name", value=f['name'])
+                if st.button("Apply", type="primary"):
+                    ok, msg = move_node(sel, mv_dest, mv_name)
+                    if ok:
+                        st.toast(msg)
+                        st.rerun()
+                    st.error(msg)
+
+            if st.button("Delete Folder (recursive)" if is_dir else "Delete File", use_container_width=True):
+                delete_node(sel)
                 st.session_state.selected_file = None
                 st.rerun()
     else:
         st.info("Select a file from the tree.")
 
 with col_disk:
-    st.subheader("Physical Disk Map (64 Blocks)")
+    st.subheader(f"Physical Disk Map ({st.session_state.disk_blocks} Blocks)")
     
-    used_blocks = get_used_blocks()
-    
-    # Visual mapping
-    cols = st.columns(8)
-    for i in range(64):
-        with cols[i % 8]:
-            color = "#f3f4f6" # Free
-            label = str(i)
-            
-            # Check if this block belongs to the selected file for highlighting
-            sf = st.session_state.files.get(st.session_state.selected_file)
-            if sf:
-                if i == sf.get('index_block'): color = "#ef4444"
-                elif i in sf['data_blocks']: color = "#3b82f6"
-                elif i in used_blocks: color = "#9ca3af"
-            elif i in used_blocks:
-                color = "#9ca3af"
-                
-            st.markdown(f"""
-                <div class="disk-block" style="background:{color};">
-                    {label}
-                </div>
-            """, unsafe_allow_html=True)
+    with prof.phase("disk map figure"):
+        import plotly.graph_objects as go
+        # One heatmap for the whole disk: role per block drives the colour, owner drives the hover
+        owner = st.session_state.block_owner
+        n = len(owner)
+        role = (owner != FREE).astype(float)   # 0 free, 1 other files, 2 selected data, 3 selected index
+        sf = st.session_state.files.get(st.session_state.selected_file)
+        if sf:
+            role[sf['data_blocks']] = 2
+            if sf['index_block'] is not None: role[sf['index_block']] = 3
+        if n <= MAP_CELLS:
+            inos, inverse = np.unique(owner, return_inverse=True)
+            labels = np.array(['Free' if i == FREE else f"{st.session_state.files[i]['name']} (inode {i})" for i in inos], dtype=object)
+            cells, hover, first = n, labels[inverse], np.arange(n)
+            hovertemplate = "Block %{text}<br>%{customdata}<extra></extra>"
+        else:
+            # Large disks: one cell per `scale` blocks, coloured by the strongest role inside it
+            scale = -(-n // MAP_CELLS)
+            cells = -(-n // scale)
+            tail = cells * scale - n
+            role = np.append(role, np.zeros(tail)).reshape(cells, scale).max(axis=1)
+            used = np.append(owner != FREE, np.zeros(tail, dtype=bool)).reshape(cells, scale).sum(axis=1)
+            first = np.arange(cells) * scale
+            hover = np.array([f"{b}–{min(b + scale, n) - 1}: {u} of {scale} used" for b, u in zip(first.tolist(), used.tolist())], dtype=object)
+            hovertemplate = "Blocks %{customdata}<extra></extra>"
+        width = 8 if cells <= 64 else int(np.ceil(np.sqrt(cells)))
+        rows = -(-cells // width)
+        pad = rows * width - cells
+
+        fig = go.Figure(go.Heatmap(
+            z=np.append(role, np.full(pad, np.nan)).reshape(rows, width),
+            text=np.append(first, np.arange(cells, cells + pad)).reshape(rows, width),
+            customdata=np.append(hover, np.full(pad, '', dtype=object)).reshape(rows, width),
+            texttemplate="%{text}" if n <= 256 else None,
+            hovertemplate=hovertemplate,
+            zmin=0, zmax=3, showscale=False,
+            colorscale=[[0, '#f3f4f6'], [0.25, '#f3f4f6'], [0.25, '#9ca3af'], [0.5, '#9ca3af'],
+                        [0.5, '#3b82f6'], [0.75, '#3b82f6'], [0.75, '#ef4444'], [1, '#ef4444']],
+            xgap=3 if n <= 1024 else 0, ygap=3 if n <= 1024 else 0,
+        ))
+        fig.update_layout(
+            height=450, margin=dict(l=10, r=10, t=10, b=10),
+            xaxis=dict(visible=False), yaxis=dict(visible=False, autorange='reversed'),
+            plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)',
+        )
+    with prof.phase("disk map render"):
+        st.plotly_chart(fig, use_container_width=True)
             
     st.markdown("""
         <div style="display:flex; gap:10px; margin-top:10px; font-size:12px;">
@@ -211,5 +1022,167 @@ with col_disk:
         </div>
     """, unsafe_allow_html=True)
 
+    with st.expander("Fragmentation Statistics"), prof.phase("fragmentation stats"):
+        frag_rows, frag_summary = fragmentation_stats()
+        g1, g2, g3 = st.columns(3)
+        g1.metric("Free Blocks", f"{frag_summary['free_blocks']:,}")
+        g2.metric("Free Extents", f"{frag_summary['free_extents']:,}")
+        g3.metric("Largest Free Run", f"{frag_summary['largest_free']:,}")
+        if frag_rows:
+            import pandas as pd
+            st.dataframe(pd.DataFrame(frag_rows), use_container_width=True, hide_index=True,
+                         column_config={'Fragmentation': st.column_config.ProgressColumn(min_value=0, max_value=1)})
+
+st.divider()
+
+# BUFFER CACHE
+st.subheader("🧊 Buffer Cache Simulator")
+with st.container(border=True):
+    k1, k2, k3, k4 = st.columns(4, gap="medium")
+    with k1:
+        c_policy = st.selectbox("Eviction Policy", list(CACHE_POLICIES.keys()))
+        c_size = st.number_input("Cache Size (blocks)", min_value=1, value=8)
+    with k2:
+        c_pattern = st.selectbox("Workload", ["Zipf", "Uniform", "Sequential"])
+        c_accesses = st.number_input("Accesses", min_value=1, max_value=10_000_000, value=100_000, step=10_000)
+    with k3:
+        c_write = st.radio("Write Policy", ["Write-back", "Write-through"], horizontal=True)
+        c_read_ratio = st.slider("Read Ratio", 0.0, 1.0, 0.8)
+    with k4:
+        c_ahead = st.number_input("Read-ahead (blocks)", min_value=0, max_value=16, value=0)
+        c_flush = st.number_input("Flush Interval (accesses)", min_value=0, value=1000, help="0 flushes only at the end")
+
+    b1, b2 = st.columns(2)
+    run_single = b1.button("▶ Replay Workload", type="primary", use_container_width=True)
+    run_sweep = b2.button("📈 Sweep Cache Sizes (all policies)", use_container_width=True)
+
+    if (run_single or run_sweep) and not st.session_state.files:
+        st.warning("Create some files first; the workload replays their data blocks.")
+    elif run_single or run_sweep:
+        # The replay is a pure-Python loop per access, so it runs off the script thread;
+        # the file table is copied so tree edits during the run cannot disturb it
+        opts = dict(write_back=c_write == "Write-back", read_ahead=int(c_ahead), flush_interval=int(c_flush))
+        args = (dict(st.session_state.files), c_pattern, int(c_accesses), c_read_ratio, opts)
+        if run_single:
+            start_job('cache_job', "Cache replay", replay_workload, *args, policy=c_policy, cache_size=int(c_size))
+        else:
+            start_job('cache_job', "Cache size sweep", replay_workload, *args)
+
+if st.session_state.cache_job:
+    job_monitor('cache_job')
+
+if st.session_state.get('cache_results'):
+    r = st.session_state.cache_results
+    m1, m2, m3, m4 = st.columns(4)
+    m1.metric("Hit Ratio", f"{r['hit_ratio']:.1%}", help=f"{r['policy']} with {r['cache_size']} blocks")
+    m2.metric("Disk I/Os Saved", f"{r['ios_saved']:,}", help=f"Out of {r['accesses']:,} uncached I/Os")
+    m3.metric("Disk Reads / Writes", f"{r['disk_reads']:,} / {r['disk_writes']:,}", help=f"{r['prefetched']:,} read-ahead blocks")
+    m4.metric("Dirty Flush Bursts", r['flush_bursts'], help=f"Max {r['max_burst']} blocks, avg {r['avg_burst']:.1f}")
+
+if st.session_state.get('cache_sweep'):
+    with prof.phase("cache sweep chart"):
+        import pandas as pd
+        import plotly.graph_objects as go
+        sweep_df = pd.DataFrame(st.session_state.cache_sweep)
+        fig = go.Figure()
+        for p, grp in sweep_df.groupby('policy', sort=False):
+            fig.add_trace(go.Scatter(x=grp['cache_size'], y=grp['hit_ratio'], mode='lines+markers', name=p))
+        fig.update_layout(
+            xaxis_title="Cache Size (blocks)", yaxis_title="Hit Ratio", yaxis=dict(tickformat='.0%'),
+            height=350, margin=dict(l=20, r=20, t=20, b=20),
+        )
+        st.plotly_chart(fig, use_container_width=True)
+        st.dataframe(
+            sweep_df[['policy', 'cache_size', 'hit_ratio', 'ios_saved', 'disk_reads', 'disk_writes', 'max_burst']],
+            use_container_width=True, hide_index=True
+        )
+
+st.divider()
+
+# DISK IMAGE
+st.subheader("💾 Disk Image")
+with st.container(border=True), prof.phase("disk image"):
+    img_name = st.text_input("Image Name", value="disk.img", help="A plain file name; images are kept in disk_images/ on the server")
+    img_path = image_path(img_name)
+    exists = img_path is not None and os.path.exists(img_path)
+    if img_path is None:
+        st.error("Image names cannot contain path separators or '..'")
+    overwrite = st.checkbox(f"Overwrite existing {img_name}", value=False) if exists else True
+    d1, d2, d3, d4 = st.columns(4)
+    with d1:
+        with st.popover("🆕 Format Blank Image", use_container_width=True, disabled=img_path is None):
+            new_blocks = st.number_input("Total Blocks", min_value=8, max_value=IMG_MAX_BLOCKS, value=262_144, step=4096)
+            st.caption(f"{new_blocks * IMG_BLOCK / 2**30:.2f} GiB, allocated sparsely"
+                       + (f"; only fsck and the inspector open images over {SESSION_MAX_BLOCKS:,} blocks"
+                          if new_blocks > SESSION_MAX_BLOCKS else ""))
+            if st.button("Format", type="primary", disabled=not overwrite):
+                try:
+                    format_image(img_path, int(new_blocks))
+                    st.toast(f"Formatted {img_name}")
+                except OSError as e:
+                    st.error(f"Cannot format {img_name}: {image_error(e)}")
+    if d2.button("⬇️ Save Session to Image", use_container_width=True, disabled=img_path is None or not overwrite):
+        try:
+            ok, msg = save_image(img_path, st.session_state.files, st.session_state.directories, st.session_state.disk_blocks)
+        except OSError as e:
+            ok, msg = False, f"Cannot save {img_name}: {image_error(e)}"
+        if ok: st.toast(msg)
+        else: st.error(msg)
+    with d3:
+        repair = st.checkbox("Repair bitmap", help="Rebuild the free-space bitmap and free count from inode references")
+        run_fsck = st.button("🔍 Run fsck", use_container_width=True, disabled=img_path is None)
+    # Every open below can fail on a directory, a truncated file or a foreign file
+    if run_fsck:
+        try:
+            with DiskImage(img_path, writable=repair) as img:
+                st.session_state.fsck_report = fsck_image(img, repair=repair)
+        except (OSError, ValueError) as e:
+            st.error(f"fsck: {image_error(e)}")
+    if d4.button("⬆️ Load Image into Session", use_container_width=True, disabled=img_path is None):
+        try:
+            with DiskImage(img_path) as img:
+                loaded = load_image(img)
+                total_blocks = img.total_blocks
+        except (OSError, ValueError) as e:
+            st.error(f"Cannot load {img_name}: {image_error(e)}")
+        else:
+            (st.session_state.files, st.session_state.directories,
+             st.session_state.next_ino, st.session_state.block_owner) = loaded
+            st.session_state.disk_blocks = total_blocks
+            st.session_state.selected_file = None
+            st.session_state.expanded_dirs = {ROOT_INO}
+            st.session_state.tree_limits = {}
+            st.rerun()
+
+    if img_path is not None and os.path.exists(img_path):
+        try:
+            with DiskImage(img_path) as img:
+                s1, s2, s3, s4 = st.columns(4)
+                s1.metric("Total Blocks", f"{img.total_blocks:,}")
+                s2.metric("Free Blocks", f"{img.free_blocks:,}")
+                s3.metric("Inode Slots", f"{img.inode_count:,}")
+                s4.metric("Image Size", f"{len(img.mm) / 2**20:,.1f} MiB")
+                page = int(st.number_input("Inode Page", min_value=0, value=0, help="100 inode slots per page"))
+                error = geometry_error(img)
+                nodes = [] if error else list(img.inodes(page * 100, page * 100 + 100))
+                if error:
+                    st.warning(f"Inode table unreadable: {error}")
+                elif nodes:
+                    import pandas as pd
+                    st.dataframe(pd.DataFrame(nodes), use_container_width=True, hide_index=True)
+                else:
+                    st.caption("No inodes on this page.")
+        except (OSError, ValueError) as e:
+            st.error(image_error(e))
+
+    if st.session_state.get('fsck_report') is not None:
+        if st.session_state.fsck_report:
+            import pandas as pd
+            st.dataframe(pd.DataFrame(st.session_state.fsck_report), use_container_width=True, hide_index=True)
+        else:
+            st.success("fsck: image is consistent")
+
+render_profile_panel(prof)
+
 st.divider()
 st.caption("OS Simulator v2.0 | File Systems Module")
\ No newline at end of file
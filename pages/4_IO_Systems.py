@@ -1,81 +1,483 @@
 import streamlit as st
-import pandas as pd
-import plotly.graph_objects as go
+import numpy as np
+from bisect import bisect_left, bisect_right, insort
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from datetime import datetime
+from core.background import start_job, finished_job, job_monitor
+from core.profiling import render_profile_panel
+from core.resources import worker_pool
+from core.ui import setup_page
 
 # Page configuration
-st.set_page_config(
-    page_title="I/O Systems - OS Simulator",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
-
-# Professional CSS Styling
-st.markdown("""
-<style>
-    :root {
-        --primary: #2563eb;
-        --text-primary: #1e293b;
-    }
-    .metric-card {
-        background: linear-gradient(135deg, #1f2937 0%, #111827 100%);
-        color: white;
-        padding: 1.5rem;
-        border-radius: 12px;
-        text-align: center;
-        border: 1px solid #374151;
-    }
-    .metric-value { font-size: 2rem; font-weight: 800; color: #3b82f6; }
-    .metric-label { font-size: 0.75rem; color: #9ca3af; text-transform: uppercase; }
-</style>
-""", unsafe_allow_html=True)
+prof = setup_page("I/O Systems - OS Simulator", "I/O Systems")
 
 # ============== DISK SCHEDULING ALGORITHMS ==============
 
-def run_disk_scheduling(requests, head, algorithm, disk_size=200):
+DISK_ALGORITHMS = ["FCFS", "SSTF", "SCAN", "C-SCAN", "LOOK", "C-LOOK"]
+
+def sstf_order(requests, head, job=None):
+    # Pending requests always form one contiguous window of the sorted queue around
+    # the head, so each step only compares the nearest cylinder on either side. All
+    # requests at a cylinder are served together; equal distances go to the cylinder
+    # whose earliest request was queued first.
+    cyls, first, count = (a.tolist() for a in np.unique(np.asarray(requests, dtype=np.int64),
+                                                        return_index=True, return_counts=True))
+    n = len(cyls)
+    order = []
+    right = bisect_left(cyls, head)
+    left = right - 1
+    current = head
+    while left >= 0 or right < n:
+        if job is not None:
+            job.checkpoint(len(order) / len(requests), lambda: [head] + order)
+        if right >= n:
+            go_left = True
+        elif left < 0:
+            go_left = False
+        else:
+            bias = (current - cyls[left]) - (cyls[right] - current)
+            go_left = bias < 0 or (bias == 0 and first[left] < first[right])
+        if go_left:
+            k = left
+            left -= 1
+        else:
+            k = right
+            right += 1
+        current = cyls[k]
+        order += [current] * count[k]
+    return order
+
+def run_disk_scheduling(requests, head, algorithm, disk_size=200, direction="right", job=None):
     sequence = [head]
-    log = []
-    total_seek = 0
     
     if algorithm == "FCFS":
         sequence += requests
     elif algorithm == "SSTF":
-        temp_req = requests.copy()
-        current = head
-        while temp_req:
-            closest = min(temp_req, key=lambda x: abs(x - current))
-            sequence.append(closest)
-            temp_req.remove(closest)
-            current = closest
-    elif algorithm == "SCAN":
-        # Simplified SCAN (moving right then left)
-        right = sorted([r for r in requests if r >= head])
-        left = sorted([r for r in requests if r < head], reverse=True)
-        sequence += right + ([disk_size - 1] if right else []) + left
-    elif algorithm == "LOOK":
-        right = sorted([r for r in requests if r >= head])
-        left = sorted([r for r in requests if r < head], reverse=True)
-        sequence += right + left
+        sequence += sstf_order(requests, head, job)
+    else:
+        # `right` is the first pass in the travel direction, `left` what lies behind the
+        # head, both in travel order; requests at the head are served on the first pass.
+        reqs = sorted(requests)
+        if direction == "left":
+            split = bisect_right(reqs, head)
+            right, left = reqs[:split][::-1], reqs[split:][::-1]
+            near_end, far_end = 0, disk_size - 1
+        else:
+            split = bisect_left(reqs, head)
+            right, left = reqs[split:], reqs[:split]
+            near_end, far_end = disk_size - 1, 0
+
+        if algorithm == "SCAN":
+            sequence += right + ([near_end] if right else []) + left[::-1]
+        elif algorithm == "C-SCAN":
+            sequence += right + ([near_end, far_end] + left if left else [])
+        elif algorithm == "LOOK":
+            sequence += right + left[::-1]
+        elif algorithm == "C-LOOK":
+            sequence += right + left
 
     # Calculate Total Seek
-    for i in range(len(sequence) - 1):
-        total_seek += abs(sequence[i+1] - sequence[i])
+    total_seek = int(np.abs(np.diff(sequence)).sum())
         
     return sequence, total_seek
 
+# ============== BATCH SWEEP ==============
+
+def sweep_seek_totals(queues, heads, algorithm, disk_size=200, direction="right"):
+    # Total seek for every (queue, head) pair as a (Q, H) array, matching run_disk_scheduling.
+    q = np.asarray(queues, dtype=np.int64)
+    h = np.asarray(heads, dtype=np.int64)[None, :]
+    n_q, n = q.shape
+    if n == 0:
+        return np.zeros((n_q, h.shape[1]), dtype=np.int64)
+    if algorithm == "FCFS":
+        return np.abs(q[:, :1] - h) + np.abs(np.diff(q, axis=1)).sum(axis=1, keepdims=True)
+
+    end = disk_size - 1
+    if direction == "left" and algorithm != "SSTF":
+        # A left sweep is a right sweep on the mirrored disk
+        q, h = end - q, end - h
+    s = np.sort(q, axis=1)
+    lo, hi = s[:, :1], s[:, -1:]
+
+    # Row-wise bisect_left via one searchsorted over rows shifted into disjoint ranges
+    shift = (np.arange(n_q, dtype=np.int64) * (2 * disk_size + 1))[:, None]
+    idx = np.searchsorted((s + shift).ravel(), h + shift) - np.arange(n_q)[:, None] * n
+    has_left, has_right = idx > 0, idx < n
+    rows = np.arange(n_q)[:, None]
+    max_left = s[rows, np.maximum(idx - 1, 0)]
+
+    if algorithm == "SCAN":
+        return np.where(~has_right, h - lo, (end - h) + np.where(has_left, end - lo, 0))
+    if algorithm == "C-SCAN":
+        return np.where(~has_left, hi - h, (end - h) + end + max_left)
+    if algorithm == "LOOK":
+        return np.where(~has_left, hi - h, np.where(~has_right, h - lo, (hi - h) + (hi - lo)))
+    if algorithm == "C-LOOK":
+        return np.where(~has_left, hi - h,
+                        np.where(~has_right, (h - lo) + (max_left - lo), (hi - h) + (hi - lo) + (max_left - lo)))
+
+    # SSTF: run sstf_order's two-pointer sweep for all pairs in lock-step, n steps in total.
+    # Each sorted row is padded with a sentinel on both ends that is always farther than any
+    # real request, so exhausted sides need no masks. first[q, k] is the queue position of
+    # the earliest request at cylinder s[q, k], for the rare equal-distance steps.
+    by_cyl = np.argsort(q, axis=1, kind='stable')
+    run_start = np.ones(s.shape, dtype=bool)
+    run_start[:, 1:] = s[:, 1:] != s[:, :-1]
+    first = np.take_along_axis(
+        by_cyl, np.maximum.accumulate(np.where(run_start, np.arange(n), 0), axis=1), axis=1
+    )
+    far = 2 * (int(max(hi.max(), h.max())) + 1)
+    s = np.hstack([np.full((n_q, 1), -far), s, np.full((n_q, 1), far)])
+    first = np.hstack([np.zeros((n_q, 1), dtype=np.int64), first, np.zeros((n_q, 1), dtype=np.int64)])
+    rows = np.broadcast_to(rows, idx.shape)
+    left, right = idx.copy(), idx + 1
+    cur = np.broadcast_to(h, idx.shape).copy()
+    total = np.zeros(idx.shape, dtype=np.int64)
+    for _ in range(n):
+        lv, rv = s[rows, left], s[rows, right]
+        bias = (cur - lv) - (rv - cur)          # negative when the left request is nearer
+        go_left = bias < 0
+        tie = bias == 0
+        if tie.any():
+            tr = rows[tie]
+            go_left[tie] = first[tr, left[tie]] < first[tr, right[tie]]
+        nxt = np.where(go_left, lv, rv)
+        total += np.abs(nxt - cur)
+        cur = nxt
+        left -= go_left
+        right += ~go_left
+    return total
+
+def random_queues(count, length, seed, chunk=256, disk_size=200):
+    # Generated a chunk at a time, each from its own seed, so a large sweep never holds
+    # all of its queues and the result does not depend on which worker ran a chunk
+    for i, start in enumerate(range(0, count, chunk)):
+        yield np.random.default_rng([seed, i]).integers(0, disk_size, size=(min(chunk, count - start), length))
+
+def run_sweep(queues, heads, algorithms, disk_size=200, direction="right", workers=4, chunk=256, pool=None,
+              total=None, job=None):
+    # `queues` is a (Q, n) array or an iterable of such chunks, e.g. random_queues().
+    # numpy releases the GIL inside the array kernels, so a thread pool over queue chunks
+    # spreads the work across cores without pickling anything to a process pool. At most
+    # 2 x workers chunks are in flight, so a lazy source is only read as fast as it is used.
+    # A long-lived `pool` is reused as is; otherwise one is created for this call.
+    if isinstance(queues, np.ndarray):
+        array, total = queues, len(queues)
+        queues = (array[i:i + chunk] for i in range(0, total, chunk))
+
+    def work(c):
+        return [sweep_seek_totals(c, heads, algo, disk_size, direction) for algo in algorithms]
+
+    parts, in_flight, done = [], deque(), 0
+    with nullcontext(pool) if pool is not None else ThreadPoolExecutor(max_workers=workers) as pool:
+        try:
+            for c in queues:
+                in_flight.append(pool.submit(work, c))
+                while len(in_flight) >= 2 * workers or (in_flight and in_flight[0].done()):
+                    parts.append(in_flight.popleft().result())
+                    done += len(parts[-1][0])
+                    if job is not None and total: job.checkpoint(done / total)
+            parts += [f.result() for f in in_flight]
+        finally:
+            for f in in_flight: f.cancel()
+    return {algo: np.vstack([p[k] for p in parts]) for k, algo in enumerate(algorithms)}
+
+def summarize_sweep(totals, n_requests):
+    stacked = np.stack(list(totals.values()))          # (algorithms, Q, H)
+    best = stacked.min(axis=0)
+    rows = []
+    for k, (algo, t) in enumerate(totals.items()):
+        rows.append({
+            'Algorithm': algo, 'Mean Seek': t.mean(), 'Median': np.median(t),
+            'P5': np.percentile(t, 5), 'P95': np.percentile(t, 95), 'Std': t.std(),
+            'Avg Seek/Req': t.mean() / max(n_requests, 1), 'Best Share': (stacked[k] == best).mean(),
+        })
+    return rows
+
+# Limits for one sweep: totals kept per algorithm (queues x head positions) and the
+# lock-step SSTF work (queues x head positions x requests), roughly a minute on one core
+SWEEP_MAX_TOTALS = 2_000_000
+SWEEP_MAX_WORK = 2_000_000_000
+
+def sweep_all(queues, heads, n_queues, n_requests, direction="right", workers=4, pool=None, job=None):
+    totals = run_sweep(queues, heads, DISK_ALGORITHMS, direction=direction, workers=workers, pool=pool,
+                       total=n_queues, job=job)
+    return {'totals': totals, 'heads': heads, 'n': n_requests, 'q': n_queues}
+
+# ============== TIME-DRIVEN DISK SIMULATOR ==============
+# Requests arrive over time while the head moves. Service time = seek (distance on a
+# configurable curve) + rotational latency (wait for the target sector to come round)
+# + transfer. The scheduler only sees requests that have arrived when it dispatches.
+
+DEFAULT_GEOMETRY = {'cylinders': 200, 'rpm': 7200, 'min_seek_ms': 0.8, 'max_seek_ms': 12.0, 'curve': 'sqrt', 'track_kb': 512}
+
+def seek_time_ms(distance, geom):
+    if distance == 0:
+        return 0.0
+    frac = distance / max(geom['cylinders'] - 1, 1)
+    shape = frac ** 0.5 if geom['curve'] == 'sqrt' else frac
+    return geom['min_seek_ms'] + (geom['max_seek_ms'] - geom['min_seek_ms']) * shape
+
+def generate_arrivals(n, rate_iops, geom, pattern="Uniform", size_kb=4, seed=42):
+    # Poisson arrivals; "Hot band" sends 80% of requests to the middle 20% of cylinders
+    rng = np.random.default_rng(seed)
+    times = np.cumsum(rng.exponential(1000.0 / rate_iops, n))
+    cyls = rng.integers(0, geom['cylinders'], n)
+    if pattern == "Hot band":
+        band = max(1, geom['cylinders'] // 5)
+        hot = rng.random(n) < 0.8
+        cyls[hot] = geom['cylinders'] // 2 - band // 2 + rng.integers(0, band, hot.sum())
+    return {'time': times, 'cyl': cyls, 'angle': rng.random(n), 'size': np.full(n, size_kb)}
+
+class CylinderQueue:
+    # Waiting requests per cylinder in arrival order. The occupied cylinders are kept in
+    # sorted buckets of 1024, so adding, removing and finding the nearest cylinder touch
+    # at most two short lists, however many cylinders or queued requests there are.
+    BUCKET_BITS = 10
+
+    def __init__(self):
+        self.waiting = {}        # cylinder -> deque of request ids
+        self.buckets = {}        # cylinder >> BUCKET_BITS -> sorted occupied cylinders
+        self.keys = []           # sorted bucket numbers
+
+    def __bool__(self):
+        return bool(self.waiting)
+
+    def add(self, cyl, rid):
+        q = self.waiting.get(cyl)
+        if q is not None:
+            q.append(rid)
+            return
+        self.waiting[cyl] = deque([rid])
+        b = cyl >> self.BUCKET_BITS
+        if b in self.buckets:
+            insort(self.buckets[b], cyl)
+        else:
+            self.buckets[b] = [cyl]
+            insort(self.keys, b)
+
+    def oldest(self, cyl):
+        return self.waiting[cyl][0]
+
+    def pop(self, cyl):
+        q = self.waiting[cyl]
+        rid = q.popleft()
+        if not q:
+            del self.waiting[cyl]
+            b = cyl >> self.BUCKET_BITS
+            bucket = self.buckets[b]
+            del bucket[bisect_left(bucket, cyl)]
+            if not bucket:
+                del self.buckets[b]
+                del self.keys[bisect_left(self.keys, b)]
+        return rid
+
+    def ceil(self, x):
+        # Lowest occupied cylinder >= x, or None
+        b = x >> self.BUCKET_BITS
+        bucket = self.buckets.get(b)
+        if bucket and bucket[-1] >= x:
+            return bucket[bisect_left(bucket, x)]
+        k = bisect_right(self.keys, b)
+        return self.buckets[self.keys[k]][0] if k < len(self.keys) else None
+
+    def floor(self, x):
+        # Highest occupied cylinder <= x, or None
+        b = x >> self.BUCKET_BITS
+        bucket = self.buckets.get(b)
+        if bucket and bucket[0] <= x:
+            return bucket[bisect_right(bucket, x) - 1]
+        k = bisect_left(self.keys, b)
+        return self.buckets[self.keys[k - 1]][-1] if k else None
+
+    def lowest(self):
+        return self.buckets[self.keys[0]][0]
+
+    def highest(self):
+        return self.buckets[self.keys[-1]][-1]
+
+def simulate_disk(arrivals, algorithm, geom, head=0, direction="right", job=None):
+    times, cyls = arrivals['time'].tolist(), arrivals['cyl'].tolist()
+    angles, sizes = arrivals['angle'].tolist(), arrivals['size'].tolist()
+    n = len(times)
+    rot_ms = 60000.0 / geom['rpm']
+    end = geom['cylinders'] - 1
+    moving_right = direction == "right"
+
+    pending_fifo = deque()
+    pending = CylinderQueue()    # the positional policies; FIFO within a cylinder
+    response = np.empty(n)
+    seek_total = rot_total = xfer_total = 0.0
+    t = 0.0
+    nxt = served = 0
+
+    def travel(to):
+        nonlocal t, head, seek_total
+        s = seek_time_ms(abs(to - head), geom)
+        t += s
+        seek_total += s
+        head = to
+
+    while served < n:
+        if job is not None and served & 1023 == 0:
+            job.checkpoint(served / n)
+        if not pending and not pending_fifo:
+            t = max(t, times[nxt])
+        while nxt < n and times[nxt] <= t:
+            if algorithm == "FCFS": pending_fifo.append(nxt)
+            else: pending.add(cyls[nxt], nxt)
+            nxt += 1
+
+        if algorithm == "FCFS":
+            rid = pending_fifo.popleft()
+        elif algorithm == "SSTF":
+            # Nearest cylinder; on a tie the side whose oldest request arrived first
+            lo, hi = pending.floor(head - 1), pending.ceil(head)
+            if hi is None or (lo is not None and (head - lo < hi - head or (
+                    head - lo == hi - head and pending.oldest(lo) < pending.oldest(hi)))):
+                hi = lo
+            rid = pending.pop(hi)
+        else:
+            if moving_right:
+                cyl = pending.ceil(head)
+                if cyl is None:
+                    if algorithm in ("SCAN", "C-SCAN") and head != end:
+                        travel(end)      # sweep on to the edge; new arrivals may be picked up there
+                        continue
+                    if algorithm in ("SCAN", "LOOK"):
+                        moving_right = False
+                        continue
+                    if algorithm == "C-SCAN":
+                        travel(0)
+                        continue
+                    cyl = pending.lowest()   # C-LOOK jumps straight back to the lowest request
+            else:
+                cyl = pending.floor(head)
+                if cyl is None:
+                    if algorithm in ("SCAN", "C-SCAN") and head != 0:
+                        travel(0)
+                        continue
+                    if algorithm in ("SCAN", "LOOK"):
+                        moving_right = True
+                        continue
+                    if algorithm == "C-SCAN":
+                        travel(end)
+                        continue
+                    cyl = pending.highest()
+            rid = pending.pop(cyl)
+
+        travel(cyls[rid])
+        rot = ((angles[rid] - t / rot_ms) % 1.0) * rot_ms
+        xfer = sizes[rid] / geom['track_kb'] * rot_ms
+        t += rot + xfer
+        rot_total += rot
+        xfer_total += xfer
+        response[rid] = t - times[rid]
+        served += 1
+
+    span_ms = t - times[0] if n else 0.0
+    return {
+        'algo': algorithm, 'requests': n, 'response': response,
+        'mean_ms': response.mean() if n else 0.0,
+        'p50_ms': np.percentile(response, 50) if n else 0.0,
+        'p95_ms': np.percentile(response, 95) if n else 0.0,
+        'p99_ms': np.percentile(response, 99) if n else 0.0,
+        'p999_ms': np.percentile(response, 99.9) if n else 0.0,
+        'max_ms': response.max() if n else 0.0,
+        'iops': n / span_ms * 1000 if span_ms else 0.0,
+        'utilization': (seek_total + rot_total + xfer_total) / span_ms if span_ms else 0.0,
+        'avg_seek_ms': seek_total / max(n, 1), 'avg_rot_ms': rot_total / max(n, 1), 'avg_xfer_ms': xfer_total / max(n, 1),
+    }
+
+def simulate_all(arrivals, geom, algorithms=DISK_ALGORITHMS, job=None):
+    results = []
+    for k, algo in enumerate(algorithms):
+        if job is not None: job.stage(k, len(algorithms))
+        results.append(simulate_disk(arrivals, algo, geom, job=job))
+        if job is not None: job.publish(results[:])
+    return results
+
+# ============== CHARTS ==============
+
+def head_movement_figure(seq):
+    import plotly.graph_objects as go
+    fig = go.Figure()
+    scatter = go.Scattergl if len(seq) > 5000 else go.Scatter
+    fig.add_trace(scatter(
+        x=list(range(len(seq))),
+        y=seq,
+        mode='lines+markers',
+        line=dict(color='#3b82f6', width=3),
+        marker=dict(size=10, color='#1e3a8a', symbol='circle'),
+        hovertemplate='Step %{x}<br>Track: %{y}<extra></extra>'
+    ))
+    
+    fig.update_layout(
+        xaxis_title="Step Number",
+        yaxis_title="Track Position (0-199)",
+        yaxis=dict(range=[0, 200], autorange=False),
+        height=400,
+        margin=dict(l=20, r=20, t=20, b=20),
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+    )
+    return fig
+
+def render_seek_metrics(seq, seek):
+    m1, m2 = st.columns(2)
+    m1.markdown(f"""
+        <div class="metric-card large">
+            <div class="metric-value">{seek}</div>
+            <div class="metric-label">Total Seek Distance</div>
+        </div>
+    """, unsafe_allow_html=True)
+    
+    avg_seek = seek / (len(seq) - 1) if len(seq) > 1 else 0
+    m2.markdown(f"""
+        <div class="metric-card large">
+            <div class="metric-value">{avg_seek:.1f}</div>
+            <div class="metric-label">Avg Seek/Req</div>
+        </div>
+    """, unsafe_allow_html=True)
+
+def render_partial_sequence(seq):
+    st.plotly_chart(head_movement_figure(seq), use_container_width=True)
+    render_seek_metrics(seq, int(np.abs(np.diff(seq)).sum()))
+
+def timed_table(results):
+    import pandas as pd
+    return pd.DataFrame([{k: v for k, v in r.items() if k != 'response'} for r in results]).rename(columns={
+        'algo': 'Algorithm', 'requests': 'Requests', 'mean_ms': 'Mean (ms)', 'p50_ms': 'P50', 'p95_ms': 'P95',
+        'p99_ms': 'P99', 'p999_ms': 'P99.9', 'max_ms': 'Max', 'iops': 'Throughput (IOPS)', 'utilization': 'Utilization',
+        'avg_seek_ms': 'Seek (ms)', 'avg_rot_ms': 'Rotation (ms)', 'avg_xfer_ms': 'Transfer (ms)',
+    })
+
+def render_timed_table(results):
+    st.dataframe(timed_table(results), use_container_width=True, hide_index=True,
+                 column_config={'Utilization': st.column_config.NumberColumn(format="percent")})
+
 # ============== SESSION STATE ==============
 if 'requests' not in st.session_state:
     st.session_state.requests = [98, 183, 37, 122, 14, 124, 65, 67]
 if 'io_results' not in st.session_state:
     st.session_state.io_results = None
+if 'io_job' not in st.session_state: st.session_state.io_job = None
+if 'timed_job' not in st.session_state: st.session_state.timed_job = None
+if 'sweep_job' not in st.session_state: st.session_state.sweep_job = None
 
-# ============== SIDEBAR (Navigation Only) ==============
-with st.sidebar:
-    st.title("OS Simulator")
-    if st.button("🏠 Back to Home", use_container_width=True):
-        st.switch_page("main.py")
-    st.divider()
-    st.caption("Module: I/O Systems")
+done_job = finished_job('io_job')
+if done_job:
+    seq, seek = done_job.result
+    st.session_state.io_results = {'seq': seq, 'seek': seek, 'algo': done_job.label}
+done_job = finished_job('timed_job')
+if done_job:
+    st.session_state.timed_results = done_job.result
+done_job = finished_job('sweep_job')
+if done_job:
+    st.session_state.sweep_results = done_job.result
 
 # ============== MAIN UI ==============
 st.title("💿 I/O Systems & Disk Scheduling")
@@ -86,11 +488,15 @@ with st.container(border=True):
     c1, c2, c3 = st.columns([1.5, 2, 1], gap="large")
     
     with c1:
-        algo = st.selectbox("Scheduling Algorithm", ["FCFS", "SSTF", "SCAN", "LOOK"])
+        algo = st.selectbox("Scheduling Algorithm", DISK_ALGORITHMS)
         head_start = st.number_input("Initial Head Position", value=53, min_value=0, max_value=199)
+        direction = "right"
+        if algo in ("SCAN", "C-SCAN", "LOOK", "C-LOOK"):
+            direction = st.radio("Head Direction", ["right", "left"], horizontal=True,
+                                 format_func=lambda d: "→ Towards 199" if d == "right" else "← Towards 0")
         if st.button("▶ Start Simulation", type="primary", use_container_width=True):
-            seq, seek = run_disk_scheduling(st.session_state.requests, head_start, algo)
-            st.session_state.io_results = {'seq': seq, 'seek': seek, 'algo': algo}
+            start_job('io_job', algo, run_disk_scheduling, list(st.session_state.requests), head_start, algo,
+                      direction=direction)
 
     with c2:
         st.markdown("**Request Queue Management**")
@@ -109,13 +515,18 @@ with st.container(border=True):
             st.rerun()
         if st.button("🔄 Reset Simulator", type="primary", use_container_width=True):
             st.session_state.requests = [98, 183, 37, 122, 14, 124, 65, 67]
+            if st.session_state.io_job: st.session_state.io_job.cancel()
+            st.session_state.io_job = None
             st.session_state.io_results = None
             st.rerun()
 
 st.divider()
 
 # VISUALIZATION
-if st.session_state.io_results:
+if st.session_state.io_job:
+    st.subheader(f"Head Movement Graph ({st.session_state.io_job.label}, running)")
+    job_monitor('io_job', render_partial_sequence)
+elif st.session_state.io_results:
     res = st.session_state.io_results
     col_graph, col_stats = st.columns([2, 1], gap="large")
     
@@ -123,51 +534,143 @@ if st.session_state.io_results:
         st.subheader(f"Head Movement Graph ({res['algo']})")
         
         
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(
-            x=list(range(len(res['seq']))),
-            y=res['seq'],
-            mode='lines+markers',
-            line=dict(color='#3b82f6', width=3),
-            marker=dict(size=10, color='#1e3a8a', symbol='circle'),
-            hovertemplate='Step %{x}<br>Track: %{y}<extra></extra>'
-        ))
-        
-        fig.update_layout(
-            xaxis_title="Step Number",
-            yaxis_title="Track Position (0-199)",
-            yaxis=dict(range=[0, 200], autorange=False),
-            height=400,
-            margin=dict(l=20, r=20, t=20, b=20),
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        with prof.phase("head movement figure"):
+            fig = head_movement_figure(res['seq'])
+        with prof.phase("head movement render"):
+            st.plotly_chart(fig, use_container_width=True)
 
-    with col_stats:
+    with col_stats, prof.phase("metrics"):
         st.subheader("Performance Metrics")
         
-        m1, m2 = st.columns(2)
-        m1.markdown(f"""
-            <div class="metric-card">
-                <div class="metric-value">{res['seek']}</div>
-                <div class="metric-label">Total Seek Distance</div>
-            </div>
-        """, unsafe_allow_html=True)
-        
-        avg_seek = res['seek'] / (len(res['seq']) - 1) if len(res['seq']) > 1 else 0
-        m2.markdown(f"""
-            <div class="metric-card">
-                <div class="metric-value">{avg_seek:.1f}</div>
-                <div class="metric-label">Avg Seek/Req</div>
-            </div>
-        """, unsafe_allow_html=True)
+        render_seek_metrics(res['seq'], res['seek'])
         
         st.divider()
-        st.markdown("**Full Seek Sequence:**")
-        st.code(" → ".join(map(str, res['seq'])))
+        if len(res['seq']) > 500:
+            st.markdown(f"**Seek Sequence (first 500 of {len(res['seq']):,}):**")
+        else:
+            st.markdown("**Full Seek Sequence:**")
+        st.code(" → ".join(map(str, res['seq'][:500])))
 else:
     st.info("Adjust the initial head position and queue, then click 'Start Simulation' to see results.")
 
+st.divider()
+
+# BATCH SWEEP
+st.subheader("📊 Batch Sweep: All Algorithms × Head Positions")
+with st.container(border=True):
+    s1, s2, s3 = st.columns(3, gap="large")
+    with s1:
+        sw_source = st.radio("Request Queues", ["Current queue", "Random queues"], horizontal=True)
+        sw_count = st.number_input("Number of Queues", min_value=1, max_value=100_000, value=500,
+                                   disabled=sw_source == "Current queue")
+        sw_len = st.number_input("Requests per Queue", min_value=1, max_value=10_000, value=50,
+                                 disabled=sw_source == "Current queue")
+    with s2:
+        sw_heads = st.radio("Head Positions", ["All 200", "Sampled"], horizontal=True)
+        sw_samples = st.number_input("Sampled Positions", min_value=1, max_value=200, value=20,
+                                     disabled=sw_heads == "All 200")
+        sw_dir = st.radio("Sweep Direction", ["right", "left"], horizontal=True, help="Applies to SCAN, C-SCAN, LOOK and C-LOOK")
+    with s3:
+        sw_seed = st.number_input("Random Seed", min_value=0, value=42)
+        sw_workers = st.slider("Worker Threads", 1, 16, 4)
+        if sw_source == "Current queue":
+            n_queues, n_requests = 1, len(st.session_state.requests)
+        else:
+            n_queues, n_requests = int(sw_count), int(sw_len)
+        n_heads = 200 if sw_heads == "All 200" else int(sw_samples)
+        too_big = n_queues * n_heads > SWEEP_MAX_TOTALS or n_queues * n_heads * n_requests > SWEEP_MAX_WORK
+        if st.button("▶ Run Sweep", type="primary", use_container_width=True, disabled=too_big):
+            rng = np.random.default_rng(int(sw_seed))
+            heads = np.arange(200) if sw_heads == "All 200" else np.sort(rng.choice(200, n_heads, replace=False))
+            if sw_source == "Current queue":
+                queues = np.array([st.session_state.requests], dtype=np.int64).reshape(1, -1)
+            else:
+                queues = random_queues(n_queues, n_requests, int(sw_seed))
+            start_job('sweep_job', "Batch sweep", sweep_all, queues, heads, n_queues, n_requests,
+                      direction=sw_dir, workers=sw_workers, pool=worker_pool(sw_workers))
+    if too_big:
+        st.warning(f"{n_queues:,} queues × {n_heads} positions × {n_requests:,} requests is over the sweep limit "
+                   f"({SWEEP_MAX_TOTALS:,} queue/position pairs, {SWEEP_MAX_WORK:,} request steps)")
+
+if st.session_state.sweep_job:
+    job_monitor('sweep_job')
+elif st.session_state.get('sweep_results'):
+    import pandas as pd
+    import plotly.graph_objects as go
+    sw = st.session_state.sweep_results
+    st.caption(f"{sw['q']:,} queues × {len(sw['heads'])} head positions × {len(sw['totals'])} algorithms")
+    hm_col, box_col = st.columns([3, 2], gap="large")
+    with hm_col, prof.phase("sweep heatmap"):
+        fig = go.Figure(go.Heatmap(
+            z=[t.mean(axis=0) for t in sw['totals'].values()], x=sw['heads'], y=list(sw['totals']),
+            colorscale='Blues', colorbar=dict(title="Mean Seek"),
+            hovertemplate='%{y} from track %{x}<br>Mean total seek: %{z:.1f}<extra></extra>'
+        ))
+        fig.update_layout(xaxis_title="Initial Head Position", height=350, margin=dict(l=20, r=20, t=20, b=20))
+        st.plotly_chart(fig, use_container_width=True)
+    with box_col, prof.phase("sweep box plot"):
+        fig = go.Figure()
+        for name, t in sw['totals'].items():
+            flat = t.ravel()
+            if len(flat) > 5000:   # keep the payload small; quantiles are stable at this size
+                flat = np.random.default_rng(0).choice(flat, 5000, replace=False)
+            fig.add_trace(go.Box(y=flat, name=name, boxpoints=False))
+        fig.update_layout(yaxis_title="Total Seek", showlegend=False, height=350, margin=dict(l=20, r=20, t=20, b=20))
+        st.plotly_chart(fig, use_container_width=True)
+    st.dataframe(
+        pd.DataFrame(summarize_sweep(sw['totals'], sw['n'])), use_container_width=True, hide_index=True,
+        column_config={'Best Share': st.column_config.NumberColumn(format="percent")}
+    )
+
+st.divider()
+
+# TIME-DRIVEN SIMULATOR
+st.subheader("⏱️ Time-Driven Disk Simulator")
+with st.container(border=True):
+    g1, g2, g3 = st.columns(3, gap="large")
+    with g1:
+        st.markdown("**Disk Geometry**")
+        td_cyl = st.number_input("Cylinders", min_value=2, max_value=1_000_000, value=DEFAULT_GEOMETRY['cylinders'])
+        td_rpm = st.selectbox("Spindle Speed (RPM)", [5400, 7200, 10000, 15000], index=1)
+        td_track = st.number_input("Track Capacity (KB)", min_value=1, value=DEFAULT_GEOMETRY['track_kb'])
+    with g2:
+        st.markdown("**Seek Curve**")
+        td_min = st.number_input("Track-to-Track Seek (ms)", min_value=0.0, value=DEFAULT_GEOMETRY['min_seek_ms'])
+        td_max = st.number_input("Full-Stroke Seek (ms)", min_value=0.0, value=DEFAULT_GEOMETRY['max_seek_ms'])
+        td_curve = st.radio("Curve", ["sqrt", "linear"], horizontal=True)
+    with g3:
+        st.markdown("**Workload**")
+        td_rate = st.number_input("Arrival Rate (IOPS)", min_value=1.0, value=80.0)
+        td_n = st.number_input("Requests", min_value=1, max_value=2_000_000, value=20_000, step=1000)
+        td_pattern = st.radio("Cylinder Distribution", ["Uniform", "Hot band"], horizontal=True)
+        td_size = st.number_input("Request Size (KB)", min_value=1, value=4)
+
+    geom = {'cylinders': int(td_cyl), 'rpm': td_rpm, 'min_seek_ms': td_min, 'max_seek_ms': td_max,
+            'curve': td_curve, 'track_kb': td_track}
+    if st.button("▶ Simulate All Algorithms", type="primary", use_container_width=True):
+        arrivals = generate_arrivals(int(td_n), td_rate, geom, td_pattern, td_size)
+        start_job('timed_job', "Time-driven simulation", simulate_all, arrivals, geom)
+
+if st.session_state.timed_job:
+    job_monitor('timed_job', render_timed_table)
+elif st.session_state.get('timed_results'):
+    with prof.phase("timed results"):
+        import plotly.graph_objects as go
+        results = st.session_state.timed_results
+        render_timed_table(results)
+
+        fig = go.Figure()
+        for r in results:
+            resp = np.sort(r['response'])
+            pts = np.unique(np.linspace(0, len(resp) - 1, min(len(resp), 500)).astype(int))
+            fig.add_trace(go.Scatter(x=resp[pts], y=(pts + 1) / len(resp), mode='lines', name=r['algo']))
+        fig.update_layout(
+            xaxis_title="Response Time (ms)", yaxis_title="Fraction of Requests", xaxis_type="log",
+            yaxis=dict(tickformat='.0%'), height=380, margin=dict(l=20, r=20, t=20, b=20),
+        )
+        st.plotly_chart(fig, use_container_width=True)
+
+render_profile_panel(prof)
+
 st.divider()
 st.caption("OS Simulator v2.0 | I/O Systems Module")
\ No newline at end of file